@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from apps.accounts.models import User
+from apps.accounts.models import EmailOutbox, User
 
 admin.site.register(User)
+admin.site.register(EmailOutbox)
@@ -0,0 +1,79 @@
+"""
+Stateless JWT authentication.
+
+With settings.JWT_STATELESS_AUTH, the request user of a JWT-authenticated
+request is built from the signed claims of the access token (user_id,
+user_type, is_verified) instead of loading tbl_user_auth on every request.
+The other attributes (email, name, ...) come from the model instance,
+loaded on first use through the in-process TTL cache of apps.accounts.utils.
+
+The tokens issued before these claims were added (and the OTP tokens) are
+still authenticated against the database, like with JWTAuthentication.
+"""
+
+from dj_rest_auth.jwt_auth import JWTCookieAuthentication
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.accounts.utils import get_cached_user
+
+# claims added by GenerateToken.get_tokens_for_user
+USER_CLAIMS = ("user_type", "is_verified")
+
+
+class StatelessUser(TokenUser):
+    """
+    Request user backed by the access token: id, user_type and is_verified
+    are read from its claims, any other attribute from the cached User.
+    Writes (save, set_password, ...) need the model instance, see
+    get_model_user.
+    """
+
+    @cached_property
+    def user_type(self):
+        return self.token["user_type"]
+
+    @cached_property
+    def is_verified(self):
+        return self.token["is_verified"]
+
+    @cached_property
+    def instance(self):
+        user = get_cached_user(self.id)
+        if user is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        return user
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.instance, attr)
+
+
+def get_model_user(user):
+    """the User model instance of a request user (stateless or not)"""
+
+    return user.instance if isinstance(user, StatelessUser) else user
+
+
+class StatelessUserMixin:
+    def get_user(self, validated_token):
+        claims = (api_settings.USER_ID_CLAIM, *USER_CLAIMS)
+        if not settings.JWT_STATELESS_AUTH or any(
+            claim not in validated_token for claim in claims
+        ):
+            return super().get_user(validated_token)
+
+        return StatelessUser(validated_token)
+
+
+class StatelessJWTAuthentication(StatelessUserMixin, JWTAuthentication):
+    """JWTAuthentication (Authorization header) with the stateless users"""
+
+
+class StatelessJWTCookieAuthentication(StatelessUserMixin, JWTCookieAuthentication):
+    """dj-rest-auth's JWTCookieAuthentication with the stateless users"""
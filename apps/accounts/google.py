@@ -0,0 +1,146 @@
+"""
+Google OAuth authorization code exchange, for CallbackHandleView.
+
+All the calls go through one pooled requests.Session per process, with
+(connect, read) timeouts and retries with exponential backoff. Only the
+connection errors and the 429/5xx answers are retried: the authorization
+code can be used once, a read timeout may mean Google already took it.
+
+The user is read from the id_token of the token response, verified
+locally with Google's signing keys (JWKS, fetched and cached by PyJWT's
+PyJWKClient), instead of calling the userinfo endpoint on every login.
+The userinfo endpoint is still used when there isn't any id_token, or
+when the RSA support of PyJWT (the cryptography package) isn't installed.
+
+The URLs come from the GOOGLE_OAUTH_* settings, so the exchange can run
+against a local fake server.
+"""
+
+import threading
+
+import jwt
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_lock = threading.Lock()
+_session = None
+_jwks_client = None
+
+
+class GoogleOAuthError(Exception):
+    pass
+
+
+def get_session():
+    global _session
+    with _lock:
+        if _session is None:
+            retry = Retry(
+                total=settings.GOOGLE_OAUTH_RETRIES,
+                connect=settings.GOOGLE_OAUTH_RETRIES,
+                read=0,
+                status=settings.GOOGLE_OAUTH_RETRIES,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"GET", "POST"}),
+                backoff_factor=settings.GOOGLE_OAUTH_BACKOFF,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_maxsize=settings.GOOGLE_OAUTH_POOL_SIZE, max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_jwks_client():
+    global _jwks_client
+    with _lock:
+        if _jwks_client is None:
+            _jwks_client = jwt.PyJWKClient(
+                settings.GOOGLE_OAUTH_JWKS_URL,
+                cache_keys=True,
+                lifespan=settings.GOOGLE_OAUTH_JWKS_LIFESPAN,
+                timeout=settings.GOOGLE_OAUTH_TIMEOUT[1],
+            )
+        return _jwks_client
+
+
+def reset():
+    """forget the session and the cached keys (settings changed)"""
+
+    global _session, _jwks_client
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = _jwks_client = None
+
+
+def request_json(method, url, **kwargs):
+    try:
+        response = get_session().request(
+            method, url, timeout=settings.GOOGLE_OAUTH_TIMEOUT, **kwargs
+        )
+        return response.json()
+    except (requests.RequestException, ValueError) as err:
+        raise GoogleOAuthError(f"Google didn't answer correctly: {err}")
+
+
+def exchange_code(code):
+    """Return the token response of Google for an authorization code"""
+
+    token_data = request_json(
+        "POST",
+        settings.GOOGLE_OAUTH_TOKEN_URL,
+        data={
+            "code": code,
+            "client_id": settings.GOOGLE_OAUTH_CLIENT_ID,
+            "client_secret": settings.GOOGLE_OAUTH_SECRET,
+            "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+            "grant_type": "authorization_code",
+        },
+    )
+    if "error" in token_data:
+        raise GoogleOAuthError("Failed to get access token from Google.")
+    if not token_data.get("access_token"):
+        raise GoogleOAuthError("Failed to get access token from Google response.")
+    return token_data
+
+
+def get_user_info(token_data):
+    """Return the claims (email, name, ...) of the user of a token response"""
+
+    id_token = token_data.get("id_token")
+    if id_token and jwt.algorithms.has_crypto:
+        return verify_id_token(id_token)
+
+    return request_json(
+        "GET",
+        settings.GOOGLE_OAUTH_USERINFO_URL,
+        headers={"Authorization": f"Bearer {token_data['access_token']}"},
+    )
+
+
+def verify_id_token(id_token):
+    try:
+        signing_key = get_jwks_client().get_signing_key_from_jwt(id_token)
+        claims = jwt.decode(
+            id_token,
+            signing_key.key,
+            algorithms=["RS256"],
+            audience=settings.GOOGLE_OAUTH_CLIENT_ID,
+            options={"require": ["exp", "iat", "iss", "aud"]},
+        )
+    except jwt.PyJWTError as err:
+        raise GoogleOAuthError(f"Invalid id_token from Google: {err}")
+
+    # Google uses both forms of its issuer
+    if claims["iss"] not in settings.GOOGLE_OAUTH_ISSUERS:
+        raise GoogleOAuthError("Invalid id_token from Google: wrong issuer")
+    if not claims.get("email_verified"):
+        raise GoogleOAuthError("The email of the Google account isn't verified.")
+    return claims
@@ -0,0 +1,71 @@
+"""
+manage.py prune_tokens [--batch-size N] [--sleep SECONDS]
+
+Delete the expired refresh tokens from the token blacklist tables
+(token_blacklist_outstandingtoken, and their token_blacklist_blacklistedtoken
+rows). The rows are deleted in small primary-key ordered batches, each in
+its own transaction, with a pause between them so the tables are never
+locked for long.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+
+class Command(BaseCommand):
+    help = "Delete the expired outstanding and blacklisted tokens in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of tokens deleted per transaction",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.5,
+            help="Seconds to wait between two batches",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        started_at = time.monotonic()
+        now = timezone.now()
+
+        outstanding = blacklisted = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                OutstandingToken.objects.filter(expires_at__lt=now, pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            last_pk = pks[-1]
+
+            with transaction.atomic():
+                blacklisted += BlacklistedToken.objects.filter(
+                    token_id__in=pks
+                ).delete()[0]
+                outstanding += OutstandingToken.objects.filter(pk__in=pks).delete()[0]
+
+            if len(pks) < batch_size:
+                break
+            time.sleep(options["sleep"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{outstanding} expired tokens deleted ({blacklisted} blacklisted) "
+                f"in {time.monotonic() - started_at:.1f}s"
+            )
+        )
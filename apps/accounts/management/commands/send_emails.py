@@ -0,0 +1,156 @@
+"""
+manage.py send_emails [--batch-size N] [--loop] [--interval SECONDS]
+
+Send the pending emails of the outbox (tbl_email_outbox, filled by
+Util.send_email). Each batch is claimed in a short transaction (SKIP
+LOCKED, so several workers can run at once) that moves its
+next_attempt_at EMAIL_OUTBOX_LEASE seconds ahead, then sent over one SMTP
+connection outside of any transaction, each result saved on its own.
+The emails of a worker that stopped mid-batch are sent again once their
+lease is over.
+
+An email that fails is sent again later, after EMAIL_OUTBOX_RETRY_DELAY
+seconds doubled on every failure, and is marked failed after
+EMAIL_OUTBOX_MAX_ATTEMPTS sends. With --loop the command doesn't stop,
+it waits --interval seconds whenever the outbox is empty.
+"""
+
+import datetime
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import EmailOutbox
+
+
+class Command(BaseCommand):
+    help = "Send the pending emails of the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help="Number of emails sent over one SMTP connection",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep sending the new emails instead of stopping",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait when the outbox is empty (with --loop)",
+        )
+
+    def handle(self, *args, **options):
+        sent = failed = 0
+        while True:
+            batch = self.send_batch(options["batch_size"])
+            if batch is None:
+                # the mail server can't be reached, nothing was sent
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+                continue
+
+            sent += batch[0]
+            failed += batch[1]
+            if sum(batch) < options["batch_size"]:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"{sent} emails sent, {failed} failed"))
+
+    def send_batch(self, batch_size):
+        """
+        Send the next due emails, return the number of emails sent and
+        failed (None if the connection couldn't be opened).
+        """
+
+        sent = failed = 0
+        emails = self.claim(batch_size)
+        if not emails:
+            return sent, failed
+
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as err:
+            self.stderr.write(f"Can't connect to the mail server: {err}")
+            # give the emails back, for the next try
+            EmailOutbox.objects.filter(pk__in=[email.pk for email in emails]).update(
+                next_attempt_at=timezone.now()
+            )
+            return None
+
+        try:
+            for email in emails:
+                if self.send(connection, email):
+                    sent += 1
+                else:
+                    failed += 1
+        finally:
+            connection.close()
+        return sent, failed
+
+    @staticmethod
+    def claim(batch_size):
+        """
+        Return the next due emails, leased to this worker: the other
+        workers don't select them until the lease is over
+        """
+
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(
+                EmailOutbox.objects.select_for_update(skip_locked=True)
+                .filter(status="pending", next_attempt_at__lte=now)
+                .order_by("next_attempt_at", "pk")[:batch_size]
+            )
+            if emails:
+                lease = datetime.timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+                EmailOutbox.objects.filter(
+                    pk__in=[email.pk for email in emails]
+                ).update(next_attempt_at=now + lease)
+        return emails
+
+    def send(self, connection, email):
+        message = EmailMessage(
+            subject=email.subject,
+            body=email.body,
+            from_email=email.from_email,
+            to=[email.to_email],
+            connection=connection,
+        )
+        email.attempts += 1
+        try:
+            message.send()
+        except Exception as err:
+            # a broken connection is opened again by the next send
+            connection.close()
+            email.last_error = str(err) or err.__class__.__name__
+            if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = "failed"
+            else:
+                delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+                email.next_attempt_at = timezone.now() + datetime.timedelta(
+                    seconds=delay
+                )
+            email.save(
+                update_fields=["attempts", "last_error", "status", "next_attempt_at"]
+            )
+            return False
+
+        email.status = "sent"
+        email.sent_at = timezone.now()
+        email.last_error = None
+        email.save(update_fields=["attempts", "last_error", "status", "sent_at"])
+        return True
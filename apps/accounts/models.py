@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.utils import timezone
 
 from django.contrib.auth.models import BaseUserManager, AbstractBaseUser
 
@@ -78,3 +79,39 @@ class User(AbstractBaseUser):
         "Is the user a member of staff?"
         # Simplest possible answer: All admins are staff
         return self.is_admin
+
+
+EMAIL_STATUS = (("pending", "Pending"), ("sent", "Sent"), ("failed", "Failed"))
+
+
+class EmailOutbox(models.Model):
+    """
+    Email waiting to be sent. Util.send_email adds the rows (in the
+    transaction of the request), manage.py send_emails sends them.
+    The rows still failing after EMAIL_OUTBOX_MAX_ATTEMPTS sends are
+    marked failed and kept, with their last error.
+    """
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, null=True)
+    to_email = models.EmailField(max_length=255)
+    status = models.CharField(max_length=10, choices=EMAIL_STATUS, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = "accounts"
+        db_table = "tbl_email_outbox"
+        indexes = [
+            # the emails due, read by the worker
+            models.Index(
+                fields=["status", "next_attempt_at"], name="email_outbox_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {self.to_email} ({self.status})"
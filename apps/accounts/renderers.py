@@ -1,16 +1,80 @@
-import json
-
 from rest_framework import renderers
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it's installed, in a single
+    pass and to the same bytes as DRF's compact output. The types orjson
+    doesn't handle the same way (datetime, Decimal, lazy strings, ...) go
+    through DRF's JSONEncoder. Indented (browsable/?indent) responses and
+    anything orjson can't encode fall back to JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_encode_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # same escaping as JSONRenderer, for the JavaScript consumers
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
 
 
-class UserRenderer(renderers.JSONRenderer):
+class UserRenderer(FastJSONRenderer):
     charset = "utf-8"
 
     def render(self, data, accepted_media_type=None, renderer_context=None):
-        response = ""
-        if "ErrorDetail" in str(data):
-            response = json.dumps({"errors": data})  # if error occurred
-        else:
-            response = json.dumps(data)
+        if is_error_response(data, renderer_context):
+            data = {"errors": data}  # if error occurred
+
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+def is_error_response(data, renderer_context=None):
+    """
+    Return True if data holds validation errors (ErrorDetail). Those only
+    come with 4xx/5xx responses, so successful responses aren't scanned.
+    """
+
+    response = (renderer_context or {}).get("response")
+    if response is not None and response.status_code < 400:
+        return False
+    return _contains_error_detail(data)
+
+
+def _contains_error_detail(data):
+    if isinstance(data, ErrorDetail):
+        return True
+    if isinstance(data, dict):
+        return any(_contains_error_detail(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_contains_error_detail(value) for value in data)
+    return False
+
+
+_encoder = encoders.JSONEncoder()
+
 
-        return response
+def _encode_default(obj):
+    return _encoder.default(obj)
@@ -0,0 +1,182 @@
+"""
+Per-process cache of the revoked (blacklisted) refresh tokens.
+
+simplejwt checks the token_blacklist table on every refresh, a table
+that only grows (the verify of RevocableTokenVerifyView is checked here
+too). Here the JTIs of the blacklisted tokens are kept
+in a bloom filter, synced incrementally: every TOKEN_REVOCATION_SYNC_INTERVAL
+seconds, only the rows added since the last sync (by primary key) are read.
+A JTI the filter doesn't contain was never revoked, so most checks don't
+query the database; a JTI it contains may be a false positive (or a row
+deleted since, e.g. by flushexpiredtokens) and is checked exactly.
+
+The tokens blacklisted by this process are added at once, the ones
+blacklisted by other processes are seen after the next sync. Each sync
+reads again the rows of the last SYNC_OVERLAP seconds, for the rows
+committed after a row with a higher primary key.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+SYNC_BATCH_SIZE = 10000
+# seconds of rows read again by every sync
+SYNC_OVERLAP = 60
+
+
+class BloomFilter:
+    """
+    Bloom filter sized for `capacity` items at the given false-positive
+    rate, with double hashing (blake2b) to find the bits of an item.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def get_positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "big"), int.from_bytes(
+            digest[8:], "big"
+        )
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self.get_positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.get_positions(item)
+        )
+
+
+class RevocationCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """forget everything, the next check rebuilds the filter"""
+
+        self.synced_at = None
+        self.bloom = None
+        self.capacity = None
+        # number of JTIs in the filter, the highest pk read and the
+        # (time, highest pk) of the recent syncs
+        self.count = 0
+        self.last_pk = 0
+        self.checkpoints = deque()
+
+    def sync(self, force=False):
+        """read the rows blacklisted since the last sync, if it's due"""
+
+        if not force and not self.is_sync_due():
+            return
+
+        with self._lock:
+            # another thread may have synced while this one waited
+            if force or self.is_sync_due():
+                self._sync()
+                self.synced_at = time.monotonic()
+
+    def is_sync_due(self):
+        interval = settings.TOKEN_REVOCATION_SYNC_INTERVAL
+        return self.synced_at is None or time.monotonic() - self.synced_at >= interval
+
+    def _sync(self):
+        if self.bloom is None:
+            self.capacity = self.capacity or settings.TOKEN_REVOCATION_CAPACITY
+            self._load(BloomFilter(self.capacity, settings.TOKEN_REVOCATION_ERROR_RATE))
+        else:
+            self._load(self.bloom)
+
+        if self.count > self.capacity:
+            # past its capacity the false-positive rate grows, rebuild a
+            # filter twice as large. The checks keep using the current
+            # filter until the new one is swapped in, with its state.
+            self.capacity = 2 * self.count
+            self._load(BloomFilter(self.capacity, settings.TOKEN_REVOCATION_ERROR_RATE))
+
+    def _load(self, bloom):
+        """
+        Read the new rows into bloom, from scratch when it isn't the
+        current filter. The count only grows here, for the rows read for
+        the first time (pk > last_pk), not in add().
+        """
+
+        if bloom is self.bloom:
+            count, last_pk, checkpoints = self.count, self.last_pk, self.checkpoints
+        else:
+            count, last_pk, checkpoints = 0, 0, deque()
+
+        # start from the newest sync at least SYNC_OVERLAP seconds old
+        now = time.monotonic()
+        while len(checkpoints) > 1 and checkpoints[1][0] <= now - SYNC_OVERLAP:
+            checkpoints.popleft()
+        start_pk = checkpoints[0][1] if checkpoints else 0
+
+        rows = BlacklistedToken.objects.order_by("pk").values_list("pk", "token__jti")
+        while True:
+            chunk = list(rows.filter(pk__gt=start_pk)[:SYNC_BATCH_SIZE])
+            for pk, jti in chunk:
+                bloom.add(jti)
+                if pk > last_pk:
+                    count += 1
+            if chunk:
+                start_pk = chunk[-1][0]
+                last_pk = max(last_pk, start_pk)
+            if len(chunk) < SYNC_BATCH_SIZE:
+                break
+        checkpoints.append((now, last_pk))
+
+        self.bloom, self.count, self.last_pk, self.checkpoints = (
+            bloom,
+            count,
+            last_pk,
+            checkpoints,
+        )
+
+    def add(self, jti):
+        self.sync()
+        with self._lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+    def is_revoked(self, jti):
+        self.sync()
+        # a sync of another thread only swaps in a complete filter, but a
+        # reset() may leave none: check exactly then
+        bloom = self.bloom
+        if bloom is not None and jti not in bloom:
+            return False
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+revocation_cache = RevocationCache()
+
+
+class RevocableRefreshToken(RefreshToken):
+    """RefreshToken checked against (and added to) the revocation cache"""
+
+    def check_blacklist(self):
+        if revocation_cache.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        revocation_cache.add(self.payload[api_settings.JTI_CLAIM])
+        return result
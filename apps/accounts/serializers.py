@@ -2,8 +2,16 @@ from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.utils.encoding import DjangoUnicodeDecodeError, force_bytes, smart_str
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
 
 from apps.accounts.models import User
+from apps.accounts.revocation import RevocableRefreshToken, revocation_cache
 from apps.accounts.utils import *
 
 # from apps.accounts.views import OTP_DummyToken
@@ -237,3 +245,19 @@ class GoogleAuthSerializer(serializers.Serializer):
 
     def create(self, validate_data):
         return User.objects.create_user(**validate_data)
+
+
+# Access token from a refresh token, revocation checked with the
+# in-process cache of the token blacklist
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RevocableRefreshToken
+
+
+# Token verification, a revoked (logged out) refresh token isn't valid
+# anymore, checked with the same cache
+class RevocableTokenVerifySerializer(TokenVerifySerializer):
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+        if revocation_cache.is_revoked(token[api_settings.JTI_CLAIM]):
+            raise TokenError("Token is blacklisted")
+        return {}
@@ -0,0 +1,15 @@
+"""
+Signal handlers that keep the in-process user cache (apps.accounts.utils)
+in sync with tbl_user_auth.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.models import User
+from apps.accounts.utils import user_cache
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    user_cache.pop(str(instance.pk))
@@ -0,0 +1,84 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.authentication import StatelessUser
+from apps.accounts.models import User
+from apps.accounts.utils import TTLCache, user_cache
+from apps.accounts.views import GenerateToken
+
+
+class StatelessAuthenticationTestCase(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="null@example.com",
+            name="Null User",
+            user_type="Employer",
+            password="password",
+        )
+        self.user.is_verified = True
+        self.user.save()
+        tokens = GenerateToken.get_tokens_for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.access = tokens["access"]
+
+    def test_tokens_have_user_claims(self):
+        token = AccessToken(self.access)
+        self.assertEqual(token["user_id"], str(self.user.id))
+        self.assertEqual(token["user_type"], "Employer")
+        self.assertTrue(token["is_verified"])
+
+    @override_settings(JWT_STATELESS_AUTH=True)
+    def test_restricted_without_query(self):
+        with self.assertNumQueries(0):
+            response = self.client.get("/restricted/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.wsgi_request.user, StatelessUser)
+
+    @override_settings(JWT_STATELESS_AUTH=True)
+    def test_profile_uses_user_cache(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/profile/")
+        self.assertEqual(response.json()["email"], "null@example.com")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/profile/")
+        self.assertEqual(response.json()["name"], "Null User")
+
+        # saving the user drops it from the cache
+        self.user.name = "Renamed User"
+        self.user.save()
+        response = self.client.get("/profile/")
+        self.assertEqual(response.json()["name"], "Renamed User")
+
+    @override_settings(JWT_STATELESS_AUTH=True)
+    def test_token_without_claims_loads_user(self):
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/restricted/")
+        self.assertIsInstance(response.wsgi_request.user, User)
+
+    def test_disabled_loads_user(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/restricted/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.wsgi_request.user, User)
+
+
+class TTLCacheTestCase(TestCase):
+    def test_expiry_and_size(self):
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        # "b" is the least recently used
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+
+        cache.ttl = 0
+        cache.set("d", 4)
+        self.assertIsNone(cache.get("d"))
@@ -0,0 +1,198 @@
+import datetime
+import socketserver
+import threading
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from apps.accounts.management.commands.send_emails import Command as SendEmailsCommand
+from apps.accounts.models import EmailOutbox
+from apps.accounts.utils import Util
+
+
+class PruneTokensTestCase(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        for number in range(5):
+            token = OutstandingToken.objects.create(
+                jti=f"expired-{number}",
+                token="token",
+                expires_at=now - datetime.timedelta(days=1),
+            )
+            if number % 2 == 0:
+                BlacklistedToken.objects.create(token=token)
+        OutstandingToken.objects.create(
+            jti="valid", token="token", expires_at=now + datetime.timedelta(days=1)
+        )
+
+    def test_prune_expired_in_batches(self):
+        stdout = StringIO()
+        call_command("prune_tokens", "--batch-size", "2", "--sleep", "0", stdout=stdout)
+
+        self.assertIn("5 expired tokens deleted (3 blacklisted)", stdout.getvalue())
+        self.assertEqual(
+            list(OutstandingToken.objects.values_list("jti", flat=True)), ["valid"]
+        )
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """minimal SMTP server, keeps the messages it receives"""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 localhost")
+        while True:
+            line = self.rfile.readline().decode().strip()
+            command = line[:4].upper()
+            if not line or command == "QUIT":
+                self.reply("221 bye")
+                return
+            if command == "RCPT" and "refused" in line:
+                self.reply("550 no such user")
+            elif command == "DATA":
+                self.reply("354 go ahead")
+                lines = []
+                while True:
+                    data = self.rfile.readline().decode()
+                    if data in ("", ".\r\n"):
+                        break
+                    lines.append(data)
+                self.server.messages.append("".join(lines))
+                self.reply("250 queued")
+            else:
+                self.reply("250 ok")
+
+
+@override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_DELAY=60)
+class SendEmailsTestCase(TestCase):
+    def add_emails(self, *to_emails):
+        for to_email in to_emails:
+            Util.send_email(
+                {"subject": "Verify", "body": "OTP 123456", "to_email": to_email}
+            )
+
+    def send_emails(self, *args):
+        stdout = StringIO()
+        call_command("send_emails", *args, stdout=stdout, stderr=StringIO())
+        return stdout.getvalue()
+
+    def test_send_email_only_adds_to_outbox(self):
+        self.add_emails("null@example.com")
+
+        self.assertEqual(mail.outbox, [])
+        email = EmailOutbox.objects.get()
+        self.assertEqual(
+            (email.status, email.to_email), ("pending", "null@example.com")
+        )
+
+        self.assertIn("1 emails sent, 0 failed", self.send_emails())
+        self.assertEqual(mail.outbox[0].to, ["null@example.com"])
+        self.assertEqual(mail.outbox[0].body, "OTP 123456")
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ("sent", 1))
+
+        # sent emails aren't sent again
+        self.assertIn("0 emails sent", self.send_emails())
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_batches(self):
+        self.add_emails(*(f"user{number}@example.com" for number in range(5)))
+
+        self.assertIn("5 emails sent", self.send_emails("--batch-size", "2"))
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_claimed_batch_leased(self):
+        self.add_emails("null@example.com", "other@example.com")
+
+        emails = SendEmailsCommand.claim(batch_size=1)
+        self.assertEqual(len(emails), 1)
+        self.assertGreater(
+            EmailOutbox.objects.get(pk=emails[0].pk).next_attempt_at,
+            timezone.now() + datetime.timedelta(seconds=60),
+        )
+        # the other workers only get the rest, without waiting for a lock
+        self.assertEqual(
+            [email.pk for email in SendEmailsCommand.claim(batch_size=2)],
+            [EmailOutbox.objects.exclude(pk=emails[0].pk).get().pk],
+        )
+
+
+class SendEmailsSMTPTestCase(SendEmailsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.settings_override = override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=cls.server.server_address[1],
+            EMAIL_HOST_USER="",
+            EMAIL_USE_TLS=False,
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.connections = 0
+        self.server.messages = []
+
+    def test_send_email_only_adds_to_outbox(self):
+        self.add_emails("null@example.com")
+        self.assertEqual(self.server.connections, 0)
+
+        self.assertIn("1 emails sent", self.send_emails())
+        self.assertIn("To: null@example.com", self.server.messages[0])
+
+    def test_batches(self):
+        self.add_emails(*(f"user{number}@example.com" for number in range(5)))
+
+        self.assertIn("5 emails sent", self.send_emails("--batch-size", "2"))
+        self.assertEqual(len(self.server.messages), 5)
+        # one connection per batch
+        self.assertEqual(self.server.connections, 3)
+
+    def test_retry_then_failed(self):
+        self.add_emails("refused@example.com", "null@example.com")
+
+        self.assertIn("1 emails sent, 1 failed", self.send_emails())
+        email = EmailOutbox.objects.get(to_email="refused@example.com")
+        self.assertEqual((email.status, email.attempts), ("pending", 1))
+        self.assertIn("no such user", email.last_error)
+        self.assertGreater(
+            email.next_attempt_at, timezone.now() + datetime.timedelta(seconds=50)
+        )
+
+        # not due yet
+        self.assertIn("0 emails sent, 0 failed", self.send_emails())
+
+        EmailOutbox.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        self.assertIn("0 emails sent, 1 failed", self.send_emails())
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ("failed", 2))
+        self.assertEqual(len(self.server.messages), 1)
+
+    def test_server_unreachable(self):
+        self.add_emails("null@example.com")
+
+        with override_settings(EMAIL_PORT=1):
+            self.assertIn("0 emails sent", self.send_emails())
+        email = EmailOutbox.objects.get()
+        self.assertEqual((email.status, email.attempts), ("pending", 0))
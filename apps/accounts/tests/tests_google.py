@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from django.test import TestCase, override_settings
+
+from apps.accounts import google
+from apps.accounts.models import User
+
+
+class FakeGoogleHandler(BaseHTTPRequestHandler):
+    """token, userinfo and JWKS endpoints, answers set by the test case"""
+
+    def do_POST(self):
+        self.server.calls.append(self.path)
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.answer(self.server.token_answers.pop(0))
+
+    def do_GET(self):
+        self.server.calls.append(self.path)
+        if self.path == "/certs":
+            self.answer((200, self.server.jwks))
+        else:
+            self.answer((200, self.server.user_info))
+
+    def answer(self, answer):
+        status, body = answer[:2]
+        if len(answer) > 2:
+            time.sleep(answer[2])
+        content = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        except BrokenPipeError:
+            # the client timed out
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeGoogleTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGoogleHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.settings_override = override_settings(
+            GOOGLE_OAUTH_CLIENT_ID="client-id",
+            GOOGLE_OAUTH_TOKEN_URL=f"{url}/token",
+            GOOGLE_OAUTH_USERINFO_URL=f"{url}/userinfo",
+            GOOGLE_OAUTH_JWKS_URL=f"{url}/certs",
+            GOOGLE_OAUTH_TIMEOUT=(1, 0.5),
+            GOOGLE_OAUTH_BACKOFF=0,
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        google.reset()
+        super().tearDownClass()
+
+    def setUp(self):
+        google.reset()
+        self.server.calls = []
+        self.server.token_answers = []
+        self.server.user_info = {"email": "null@example.com", "name": "Null User"}
+        User.objects.create_user(
+            email="null@example.com",
+            name="Null User",
+            user_type="Job Seeker",
+            password="password",
+        )
+
+    def callback(self):
+        return self.client.get("/google/login/callback/", {"code": "code"})
+
+    def test_login_with_userinfo(self):
+        self.server.token_answers = [(200, {"access_token": "access"})]
+
+        response = self.callback()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.json()["token"])
+        self.assertEqual(self.server.calls, ["/token", "/userinfo"])
+
+    def test_retry_unavailable(self):
+        self.server.token_answers = [
+            (503, {"error": "unavailable"}),
+            (200, {"access_token": "access"}),
+        ]
+
+        self.assertEqual(self.callback().status_code, 200)
+        self.assertEqual(self.server.calls, ["/token", "/token", "/userinfo"])
+
+    def test_timeout_not_retried(self):
+        self.server.token_answers = [(200, {"access_token": "access"}, 1)]
+
+        response = self.callback()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.server.calls, ["/token"])
+
+    def test_token_error(self):
+        self.server.token_answers = [(400, {"error": "invalid_grant"})]
+
+        response = self.callback()
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Failed to get access token", response.json()["error"])
+
+    @unittest.skipUnless(jwt.algorithms.has_crypto, "cryptography isn't installed")
+    def test_id_token_verified_with_cached_keys(self):
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+        self.server.jwks = {"keys": [{**jwk, "kid": "key-1", "use": "sig"}]}
+
+        def id_token(**claims):
+            now = int(time.time())
+            payload = {
+                "iss": "https://accounts.google.com",
+                "aud": "client-id",
+                "iat": now,
+                "exp": now + 60,
+                "email": "null@example.com",
+                "email_verified": True,
+                "name": "Null User",
+                **claims,
+            }
+            return jwt.encode(
+                payload, private_key, algorithm="RS256", headers={"kid": "key-1"}
+            )
+
+        self.server.token_answers = [
+            (200, {"access_token": "access", "id_token": id_token()}),
+            (200, {"access_token": "access", "id_token": id_token()}),
+            (200, {"access_token": "access", "id_token": id_token(aud="other")}),
+        ]
+        self.assertEqual(self.callback().status_code, 200)
+        self.assertEqual(self.callback().status_code, 200)
+        self.assertEqual(self.callback().status_code, 400)
+        # the keys are fetched once, the userinfo endpoint isn't called
+        self.assertEqual(self.server.calls, ["/token", "/certs", "/token", "/token"])
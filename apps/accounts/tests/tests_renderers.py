@@ -0,0 +1,66 @@
+import datetime
+import decimal
+import json
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework import renderers, status
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.response import Response
+
+from apps.accounts.renderers import FastJSONRenderer, UserRenderer
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    data = {
+        "id": uuid.UUID("6f1c1f4e-7f0a-4c1e-9a55-0f1b4b2d0c6e"),
+        "created_at": datetime.datetime(2023, 10, 1, 12, 30, 15, 123456),
+        "post_date": datetime.date(2023, 10, 1),
+        "salary": decimal.Decimal("1200.50"),
+        "about": "café\u2028line",
+        "tags": ("a", "b"),
+        "counts": {1: 2},
+        "nested": [{"none": None, "flag": True, "ratio": 0.1}],
+    }
+
+    def test_same_bytes_as_json_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.data),
+            renderers.JSONRenderer().render(self.data),
+        )
+
+    def test_indent_and_none(self):
+        renderer = FastJSONRenderer()
+        self.assertEqual(renderer.render(None), b"")
+        self.assertEqual(
+            renderer.render(self.data, "application/json; indent=2"),
+            renderers.JSONRenderer().render(self.data, "application/json; indent=2"),
+        )
+
+    def test_without_orjson(self):
+        with mock.patch("apps.accounts.renderers.orjson", None):
+            self.assertEqual(
+                FastJSONRenderer().render(self.data),
+                renderers.JSONRenderer().render(self.data),
+            )
+
+
+class UserRendererTest(SimpleTestCase):
+    def render(self, data, status_code):
+        context = {"response": Response(data, status=status_code)}
+        return json.loads(UserRenderer().render(data, renderer_context=context))
+
+    def test_errors_are_wrapped(self):
+        errors = {"email": [ErrorDetail("This field is required.", code="required")]}
+
+        self.assertEqual(
+            self.render(errors, status.HTTP_400_BAD_REQUEST),
+            {"errors": {"email": ["This field is required."]}},
+        )
+
+    def test_success_is_not_wrapped(self):
+        data = {"msg": "ErrorDetail is only a word here"}
+
+        self.assertEqual(self.render(data, status.HTTP_200_OK), data)
+        self.assertEqual(self.render(data, status.HTTP_400_BAD_REQUEST), data)
@@ -0,0 +1,130 @@
+import uuid
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import User
+from apps.accounts.revocation import (
+    BloomFilter,
+    RevocableRefreshToken,
+    revocation_cache,
+)
+from apps.accounts.views import GenerateToken
+
+
+class BloomFilterTestCase(SimpleTestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        items = [str(uuid.uuid4()) for _ in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        self.assertTrue(all(item in bloom for item in items))
+        false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+@override_settings(TOKEN_REVOCATION_SYNC_INTERVAL=60)
+class RevocationTestCase(TestCase):
+    def setUp(self):
+        revocation_cache.reset()
+        self.client = APIClient()
+        user = User.objects.create_user(
+            email="null@example.com",
+            name="Null User",
+            user_type="Employer",
+            password="password",
+        )
+        self.tokens = GenerateToken.get_tokens_for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+
+    def refresh(self):
+        return self.client.post(
+            "/token/refresh/", {"refresh": self.tokens["refresh"]}, format="json"
+        )
+
+    def test_refresh_without_blacklist_query(self):
+        self.assertEqual(self.refresh().status_code, 200)
+
+        # synced, the token isn't in the filter
+        with self.assertNumQueries(0):
+            response = self.refresh()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.json())
+
+    def test_logout_revokes_at_once(self):
+        self.assertEqual(self.refresh().status_code, 200)
+
+        response = self.client.post(
+            "/logout/", {"refresh_token": self.tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.refresh().status_code, 401)
+
+    def test_verify_rejects_revoked_token(self):
+        def verify():
+            return self.client.post(
+                "/token/verify/", {"token": self.tokens["refresh"]}, format="json"
+            )
+
+        self.assertEqual(verify().status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(verify().status_code, 200)
+
+        self.client.post(
+            "/logout/", {"refresh_token": self.tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(verify().status_code, 401)
+
+    def test_blacklisted_elsewhere_seen_after_sync(self):
+        self.assertEqual(self.refresh().status_code, 200)
+        jti = RefreshToken(self.tokens["refresh"])["jti"]
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=jti))
+
+        # until the next sync the check doesn't see other processes' rows
+        self.assertEqual(self.refresh().status_code, 200)
+        with override_settings(TOKEN_REVOCATION_SYNC_INTERVAL=0):
+            self.assertEqual(self.refresh().status_code, 401)
+
+    def test_false_positive_checked_exactly(self):
+        jti = RefreshToken(self.tokens["refresh"])["jti"]
+        revocation_cache.sync()
+        revocation_cache.bloom.add(jti)
+
+        with self.assertNumQueries(1):
+            self.assertFalse(revocation_cache.is_revoked(jti))
+
+    @override_settings(TOKEN_REVOCATION_CAPACITY=2)
+    def test_filter_grows_past_capacity(self):
+        for _ in range(3):
+            user = User.objects.create_user(
+                email=f"{uuid.uuid4().hex}@example.com",
+                name="Null User",
+                user_type="Employer",
+                password="password",
+            )
+            RefreshToken.for_user(user).blacklist()
+
+        self.assertFalse(revocation_cache.is_revoked("unknown"))
+        self.assertEqual(revocation_cache.capacity, 6)
+        self.assertEqual(revocation_cache.count, 3)
+
+    def test_local_blacklist_counted_once(self):
+        revocation_cache.sync()
+        RevocableRefreshToken(self.tokens["refresh"]).blacklist()
+        revocation_cache.sync(force=True)
+
+        self.assertEqual(revocation_cache.count, 1)
+
+    def test_check_without_filter(self):
+        # the state seen by a check racing a reset
+        revocation_cache.sync()
+        revocation_cache.bloom = None
+
+        jti = RefreshToken(self.tokens["refresh"])["jti"]
+        self.assertFalse(revocation_cache.is_revoked(jti))
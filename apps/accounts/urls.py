@@ -15,14 +15,13 @@ app_name = "apps.accounts"
 
 
 from django.urls import include, path
-from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
 
 from apps.accounts.views import *
 
 urlpatterns = [
     # Generate Access Token using Refresh Token
-    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
-    path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
+    path("token/refresh/", RevocableTokenRefreshView.as_view(), name="token_refresh"),
+    path("token/verify/", RevocableTokenVerifyView.as_view(), name="token_verify"),
     path("register/", UserRegistrationView.as_view(), name="register"),
     path("otp/verify/", OTPVerificationCheckView.as_view(), name="verify_otp"),
     path("login/", UserLoginView.as_view(), name="login"),
@@ -1,18 +1,26 @@
+import copy
 import os
+import threading
+import time
+from collections import OrderedDict
+
 import pyotp
-from django.core.mail import EmailMessage
+from django.conf import settings
+
+from apps.accounts.models import EmailOutbox, User
 
 
 class Util:
+    # the email is only added to the outbox (in the current transaction,
+    # if any), manage.py send_emails sends it
     @staticmethod
     def send_email(data):
-        email = EmailMessage(
+        EmailOutbox.objects.create(
             subject=data["subject"],
             body=data["body"],
             from_email=os.environ.get("EMAIL_FROM"),
-            to=[data["to_email"]],
+            to_email=data["to_email"],
         )
-        email.send()
 
 
 class OTP:
@@ -39,3 +47,67 @@ class OTP:
     @staticmethod
     def verify_otp(user, otp):
         return pyotp.TOTP(user.otp_secret, interval=300, digits=6).verify(otp)
+
+
+class TTLCache:
+    """
+    Small in-process cache, thread-safe. Entries expire `ttl` seconds
+    after being set, and the least recently used ones are dropped once
+    there are more than `maxsize`.
+    """
+
+    def __init__(self, ttl, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# tbl_user_auth rows by id, in front of the database for the stateless
+# JWT authentication (apps.accounts.authentication), kept in sync on save
+# by apps.accounts.signals
+user_cache = TTLCache(settings.AUTH_USER_CACHE_TTL, settings.AUTH_USER_CACHE_SIZE)
+
+
+def get_cached_user(user_id):
+    """
+    Return the User with the given id (None if there isn't any), from the
+    cache when possible. Every call gets its own copy of the instance, so
+    changing it doesn't change the cached one.
+    """
+
+    key = str(user_id)
+    user = user_cache.get(key)
+    if user is None:
+        user = User.objects.filter(id=user_id).first()
+        if user is None:
+            return None
+        user_cache.set(key, user)
+    return copy.copy(user)
@@ -3,7 +3,6 @@ import datetime
 # from django.urls import reverse
 import urllib.parse
 
-import requests
 from django.conf import settings
 from django.contrib.auth import authenticate
 from rest_framework import status
@@ -12,9 +11,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
 
+from apps.accounts import google
+from apps.accounts.authentication import get_model_user
 from apps.accounts.models import *
 from apps.accounts.renderers import UserRenderer
+from apps.accounts.revocation import RevocableRefreshToken
 from apps.accounts.serializers import *
 from apps.accounts.utils import *
 
@@ -34,8 +37,10 @@ class GenerateToken:
     @staticmethod
     def get_tokens_for_user(user):
         refresh = RefreshToken.for_user(user)
-        # custom_payload={"name":user.name,"email":user.email}
-        # refresh.payload.update(custom_payload)
+        # claims of the stateless authentication (apps.accounts.authentication),
+        # copied to the access tokens
+        refresh["user_type"] = user.user_type
+        refresh["is_verified"] = user.is_verified
         return {
             "refresh": str(refresh),
             "access": str(refresh.access_token),
@@ -173,6 +178,18 @@ class OTPVerificationCheckView(APIView):
         )
 
 
+# Generate Access Token using Refresh Token, the blacklist is checked
+# through the revocation cache (apps.accounts.revocation)
+class RevocableTokenRefreshView(TokenRefreshView):
+    serializer_class = RevocableTokenRefreshSerializer
+
+
+# Verify a token, a revoked refresh token is rejected like by
+# RevocableTokenRefreshView
+class RevocableTokenVerifyView(TokenVerifyView):
+    serializer_class = RevocableTokenVerifySerializer
+
+
 # Login the user and generate JWT token
 class UserLoginView(APIView):
     renderer_classes = [UserRenderer]
@@ -228,7 +245,7 @@ class UserLogOutView(APIView):
             # print(access_token)
             # breakpoint()
             refresh_token = request.data["refresh_token"]
-            token_obj = RefreshToken(refresh_token)
+            token_obj = RevocableRefreshToken(refresh_token)
             token_obj.blacklist()
             return Response(
                 {
@@ -316,7 +333,7 @@ class UserChangePasswordView(APIView):
 
     def post(self, request, format=None):
         serializer = UserChangePasswordSerializer(
-            data=request.data, context={"user": request.user}
+            data=request.data, context={"user": get_model_user(request.user)}
         )
         serializer.is_valid(raise_exception=True)
         return Response(
@@ -331,7 +348,7 @@ class UserChangePasswordOTPView(APIView):
 
     def post(self, request, format=None):
         serializer = UserChangePasswordOTPSerializer(
-            data=request.data, context={"user": request.user}
+            data=request.data, context={"user": get_model_user(request.user)}
         )
         serializer.is_valid(raise_exception=True)
 
@@ -371,38 +388,14 @@ class CallbackHandleView(APIView):
 
     def get(self, request):
         code = request.query_params.get("code")
-        data = {
-            "code": code,
-            "client_id": os.environ.get("GOOGLE_OAUTH_CLIENT_ID"),
-            "client_secret": os.environ.get("GOOGLE_OAUTH_SECRET"),
-            "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-            "grant_type": "authorization_code",
-        }
-
-        token_response = requests.post("https://oauth2.googleapis.com/token", data=data)
-        token_data = token_response.json()
 
-        if "error" in token_data:
-            return Response(
-                {"error": "Failed to get access token from Google."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        # Get the access token from the response
-        access_token = token_data.get("access_token", None)
-        # print(access_token)
-        if not access_token:
-            return Response(
-                {"error": "Failed to get access token from Google response."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        # token exchange and id_token check (or userinfo call), with the
+        # pooled client, timeouts and retries of apps.accounts.google
+        try:
+            user_info = google.get_user_info(google.exchange_code(code))
+        except google.GoogleOAuthError as err:
+            return Response({"error": str(err)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Use the access token to retrieve user information from Google
-        user_info_response = requests.get(
-            f"https://www.googleapis.com/oauth2/v2/userinfo?access_token={access_token}"
-        )
-        user_info = user_info_response.json()
-        # print(user_info)
         # Extract the email and name from the user information
         email = user_info.get("email", None)
         name = user_info.get("name", None)
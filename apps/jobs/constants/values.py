@@ -8,4 +8,18 @@ COMPANY_ID = "company_id"
 
 DB_TABLE_COMPANY = "tbl_company"
 DB_TABLE_JOBS = "tbl_job"
-DB_TABLE_USER_PROFILE = "tbl_user_profile"
\ No newline at end of file
+DB_TABLE_USER_PROFILE = "tbl_user_profile"
+# Applicant counters maintained on the Job table
+APPLICANTS_COUNT = "applicants_count"
+APPLICATION_STATUS_APPLIED = "applied"
+
+# Job column that counts the applications in each status
+STATUS_COUNT_FIELDS = {
+    APPLICATION_STATUS_APPLIED: "applied_count",
+    "under-reviewed": "under_reviewed_count",
+    "shortlisted": "shortlisted_count",
+    "accepted": "accepted_count",
+    "rejected": "rejected_count",
+    "on-hold": "on_hold_count",
+}
+APPLICANT_COUNTER_FIELDS = [APPLICANTS_COUNT, *STATUS_COUNT_FIELDS.values()]
@@ -0,0 +1,67 @@
+"""
+manage.py export_applicants (--job ID | --employer ID) [--format csv|ndjson]
+                            [--output FILE] [--gzip] [--chunk-size N]
+
+Export the applications of a job, or of all the jobs of an employer, with
+the applicants' profile fields. The rows are read and written in chunks,
+so the export runs in the same memory whatever its size. The output goes
+to stdout unless --output is given.
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.jobs.utils import applicant_export
+from apps.jobs.utils.validators import validationClass
+
+
+class Command(BaseCommand):
+    help = "Export the applicants of a job or of an employer as CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        owner = parser.add_mutually_exclusive_group(required=True)
+        owner.add_argument("--job", help="Export the applications of this job")
+        owner.add_argument(
+            "--employer", help="Export the applications for all the employer's jobs"
+        )
+        parser.add_argument("--format", choices=applicant_export.FORMATS, default="csv")
+        parser.add_argument(
+            "--output", default="-", help='Output file, "-" (default) for stdout'
+        )
+        parser.add_argument(
+            "--gzip", action="store_true", help="gzip-compress the output"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help="Number of applications read per query",
+        )
+
+    def handle(self, *args, **options):
+        owner_id = options["job"] or options["employer"]
+        if not validationClass.is_valid_uuid(owner_id):
+            raise CommandError(f"value {owner_id} isn't a correct id")
+
+        applications = applicant_export.get_applications(
+            job_id=options["job"], employer_id=options["employer"]
+        )
+        data = applicant_export.export_applications(
+            applications, options["format"], options["gzip"], options["chunk_size"]
+        )
+
+        if options["output"] == "-":
+            self.write_all(sys.stdout.buffer, data)
+            sys.stdout.buffer.flush()
+        else:
+            try:
+                with open(options["output"], "wb") as file:
+                    self.write_all(file, data)
+            except OSError as err:
+                raise CommandError(err)
+
+    @staticmethod
+    def write_all(file, data):
+        for chunk in data:
+            file.write(chunk)
@@ -0,0 +1,85 @@
+"""
+manage.py import_jobs <file> [--format ndjson|csv] [--chunk-size N]
+
+Import jobs from a NDJSON (one JSON object per line) or CSV (with a
+header row) file, use "-" to read from stdin. Every row needs the job
+fields and the employer_id, the file is read line by line so its size
+doesn't matter.
+"""
+
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.jobs.utils import job_import
+
+FORMATS = ("ndjson", "csv")
+
+
+class Command(BaseCommand):
+    help = "Import jobs in bulk from a NDJSON or CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help='File to import, or "-" for stdin')
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Input format, guessed from the file extension by default",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=job_import.IMPORT_CHUNK_SIZE,
+            help="Number of rows validated and created at once",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or options["file"].rsplit(".", 1)[-1].lower()
+        if file_format not in FORMATS:
+            raise CommandError("Unknown file format, use --format ndjson or csv")
+
+        if options["file"] == "-":
+            result = self.import_file(sys.stdin, file_format, options["chunk_size"])
+        else:
+            try:
+                with open(options["file"], newline="", encoding="utf-8") as file:
+                    result = self.import_file(file, file_format, options["chunk_size"])
+            except OSError as err:
+                raise CommandError(err)
+
+        for error in result["errors"]:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result['created']} jobs created, {len(result['errors'])} rows failed"
+            )
+        )
+
+    def import_file(self, file, file_format, chunk_size):
+        rows = (
+            self.read_ndjson(file) if file_format == "ndjson" else self.read_csv(file)
+        )
+        return job_import.import_jobs(rows, chunk_size=chunk_size)
+
+    @staticmethod
+    def read_ndjson(file):
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # reported as an invalid row by import_jobs
+                yield None
+
+    @staticmethod
+    def read_csv(file):
+        for row in csv.DictReader(file):
+            # empty cells fall back to the field's default value
+            yield {
+                key: value
+                for key, value in row.items()
+                if key is not None and value != ""
+            }
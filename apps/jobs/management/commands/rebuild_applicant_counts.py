@@ -0,0 +1,84 @@
+"""
+manage.py rebuild_applicant_counts [--verify] [--chunk-size N]
+
+Recompute the applicant counters of every job from tbl_applicants.
+With --verify the counters are only checked, and the command fails
+if any job's counters don't match its applications.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.jobs.constants import values
+from apps.jobs.models import Job
+from apps.jobs.utils import applicant_counters
+from apps.jobs.utils import cache as job_cache
+
+
+class Command(BaseCommand):
+    help = "Rebuild (or verify) the applicant counters stored on each job"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report the jobs whose counters are wrong, don't fix them",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of jobs checked per query",
+        )
+
+    def handle(self, *args, **options):
+        verify_only = options["verify"]
+        chunk_size = options["chunk_size"]
+
+        checked = mismatched = 0
+        last_job_id = None
+        while True:
+            with transaction.atomic():
+                # walk the jobs in primary-key order, one chunk at a time,
+                # locking the chunk so applications can't move the counters
+                # between counting and writing them
+                jobs = Job.objects.order_by(values.JOB_ID)
+                if last_job_id is not None:
+                    jobs = jobs.filter(job_id__gt=last_job_id)
+                if not verify_only:
+                    jobs = jobs.select_for_update()
+                jobs = list(
+                    jobs.values(values.JOB_ID, *values.APPLICANT_COUNTER_FIELDS)[
+                        :chunk_size
+                    ]
+                )
+                if not jobs:
+                    break
+                last_job_id = jobs[-1][values.JOB_ID]
+
+                expected_counts = applicant_counters.count_applications(
+                    [job[values.JOB_ID] for job in jobs]
+                )
+                for job in jobs:
+                    job_id = job.pop(values.JOB_ID)
+                    checked += 1
+                    if job == expected_counts[job_id]:
+                        continue
+
+                    mismatched += 1
+                    self.stdout.write(
+                        f"job {job_id}: {job} != {expected_counts[job_id]}"
+                    )
+                    if not verify_only:
+                        Job.objects.filter(job_id=job_id).update(
+                            **expected_counts[job_id], updated_at=timezone.now()
+                        )
+                        job_cache.invalidate_job_on_commit(job_id)
+
+        summary = f"{checked} jobs checked, {mismatched} with wrong counters"
+        if verify_only and mismatched:
+            raise CommandError(summary)
+        if not verify_only:
+            summary += f" ({mismatched} fixed)"
+        self.stdout.write(self.style.SUCCESS(summary))
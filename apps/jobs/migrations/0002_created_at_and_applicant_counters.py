@@ -0,0 +1,121 @@
+# Generated by Django 4.2.2 on 2026-10-18 11:40
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.utils.timezone
+
+# status -> counter column, as of this migration
+STATUS_COUNT_FIELDS = {
+    "applied": "applied_count",
+    "under-reviewed": "under_reviewed_count",
+    "shortlisted": "shortlisted_count",
+    "accepted": "accepted_count",
+    "rejected": "rejected_count",
+    "on-hold": "on_hold_count",
+}
+
+
+def fill_applicant_counters(apps, schema_editor):
+    """Initialise the new counters from the existing applications"""
+
+    Applicants = apps.get_model("jobs", "Applicants")
+    Job = apps.get_model("jobs", "Job")
+
+    counters = {}
+    rows = (
+        Applicants.objects.values("job_id", "status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        job_counters = counters.setdefault(row["job_id"], {"applicants_count": 0})
+        job_counters["applicants_count"] += row["count"]
+        status_field = STATUS_COUNT_FIELDS.get(row["status"])
+        if status_field:
+            job_counters[status_field] = row["count"]
+
+    for job_id, job_counters in counters.items():
+        Job.objects.filter(job_id=job_id).update(**job_counters)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="company",
+            name="created_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="accepted_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="applicants_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="applied_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="on_hold_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="rejected_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="shortlisted_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="under_reviewed_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="created_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="applicants",
+            index=models.Index(
+                fields=["user", "created_at"], name="applicants_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="company",
+            index=models.Index(
+                fields=["created_at", "company_id"], name="company_created_at_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["created_at", "job_id"], name="job_created_at_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["created_at", "user_id"], name="user_created_at_idx"
+            ),
+        ),
+        migrations.RunPython(fill_applicant_counters, migrations.RunPython.noop),
+    ]
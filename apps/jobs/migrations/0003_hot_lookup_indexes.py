@@ -0,0 +1,42 @@
+# Generated by Django 4.2.2 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0002_created_at_and_applicant_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="applicants",
+            index=models.Index(fields=["job", "user"], name="applicants_job_user_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="applicants",
+            index=models.Index(fields=["user", "job"], name="applicants_user_job_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="applicants",
+            index=models.Index(
+                fields=["employer_id", "status"], name="applicants_employer_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["company", "location"], name="job_company_location_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(fields=["employer_id"], name="job_employer_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["user_id", "user_type"], name="user_id_user_type_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.2 on 2026-10-18 11:41
+
+from django.db import migrations, models
+from django.db.models import Count, F, Min
+
+# status -> counter column, as of this migration
+STATUS_COUNT_FIELDS = {
+    "applied": "applied_count",
+    "under-reviewed": "under_reviewed_count",
+    "shortlisted": "shortlisted_count",
+    "accepted": "accepted_count",
+    "rejected": "rejected_count",
+    "on-hold": "on_hold_count",
+}
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    """
+    Keep only the first application of each (job, user) pair, so the
+    unique constraint can be added, and take the removed ones out of
+    the job's applicant counters.
+    """
+
+    Applicants = apps.get_model("jobs", "Applicants")
+    Job = apps.get_model("jobs", "Job")
+
+    duplicates = (
+        Applicants.objects.values("job_id", "user_id")
+        .annotate(first_id=Min("id"), count=Count("id"))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    for duplicate in duplicates:
+        applications = Applicants.objects.filter(
+            job_id=duplicate["job_id"], user_id=duplicate["user_id"]
+        ).exclude(id=duplicate["first_id"])
+
+        for application in applications:
+            counters = {"applicants_count": F("applicants_count") - 1}
+            status_field = STATUS_COUNT_FIELDS.get(application.status)
+            if status_field:
+                counters[status_field] = F(status_field) - 1
+            Job.objects.filter(job_id=application.job_id).update(**counters)
+        applications.delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0003_hot_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="applicants",
+            constraint=models.UniqueConstraint(
+                fields=("job", "user"), name="applicants_unique_job_user"
+            ),
+        ),
+        # the unique constraint's index covers the (job, user) lookups
+        migrations.RemoveIndex(
+            model_name="applicants",
+            name="applicants_job_user_idx",
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.2 on 2026-10-18 11:48
+
+import apps.jobs.models
+from django.db import migrations
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0004_unique_application_per_user"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="company",
+            name="updated_at",
+            field=apps.jobs.models.UpdatedAtField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="updated_at",
+            field=apps.jobs.models.UpdatedAtField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+import datetime
+
+from django.db import migrations
+from django.db.models import Count
+
+BATCH_SIZE = 1000
+
+
+def stagger_created_at(apps, schema_editor):
+    """
+    0002 gave every existing company and profile the same created_at.
+    The cursor pagination only keeps created_at in its cursors and skips
+    the rows of a tied value with an offset, so give each row of a tied
+    value its own timestamp, one microsecond apart (by primary key) and
+    earlier than the shared one.
+    """
+
+    for model_name in ("Company", "User"):
+        model = apps.get_model("jobs", model_name)
+        tied_values = (
+            model.objects.values("created_at")
+            .annotate(count=Count("pk"))
+            .filter(count__gt=1)
+            .order_by()
+            .values_list("created_at", flat=True)
+        )
+        for created_at in list(tied_values):
+            pks = (
+                model.objects.filter(created_at=created_at)
+                .order_by("-pk")
+                .values_list("pk", flat=True)
+            )
+            rows = [
+                model(pk=pk, created_at=created_at - datetime.timedelta(microseconds=n))
+                for n, pk in enumerate(pks)
+            ]
+            model.objects.bulk_update(rows, ["created_at"], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0005_company_user_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(stagger_created_at, migrations.RunPython.noop),
+    ]
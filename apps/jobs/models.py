@@ -1,6 +1,7 @@
 import uuid
 
 from django.db import models
+from django.utils import timezone
 
 from apps.jobs.constants import values
 from apps.accounts.models import User as UserAuth
@@ -13,6 +14,24 @@ STATUS_CHOICES = (
     ("on-hold", "On-Hold"),
 )
 
+
+class UpdatedAtField(models.DateTimeField):
+    """
+    Set to the current time on every save(), like auto_now, but with a
+    default so that fixtures without the field still load (loaddata
+    doesn't call pre_save).
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("default", timezone.now)
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def pre_save(self, model_instance, add):
+        value = timezone.now()
+        setattr(model_instance, self.attname, value)
+        return value
+
 class Company(models.Model):
     """
     Represents a company with related details.
@@ -23,6 +42,12 @@ class Company(models.Model):
 
     class Meta:
         db_table = values.DB_TABLE_COMPANY
+        indexes = [
+            # used by the cursor pagination ordering
+            models.Index(
+                fields=["created_at", "company_id"], name="company_created_at_idx"
+            ),
+        ]
 
     name = models.CharField(max_length=255, null=False)
     location = models.CharField(max_length=255, null=False)
@@ -30,6 +55,9 @@ class Company(models.Model):
     company_id = models.UUIDField(
         primary_key=True, default=uuid.uuid4, editable=False
     )  # uuid1 uses network address for random number, so it's better to use uuid4
+    # default (not auto_now_add) so fixtures without a timestamp still load
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = UpdatedAtField()
 
     def __str__(self):
         return self.name
@@ -45,6 +73,16 @@ class Job(models.Model):
 
     class Meta:
         db_table = values.DB_TABLE_JOBS
+        indexes = [
+            # used by the cursor pagination ordering
+            models.Index(fields=["created_at", "job_id"], name="job_created_at_idx"),
+            # /jobs?company=&location= filters
+            models.Index(
+                fields=["company", "location"], name="job_company_location_idx"
+            ),
+            # employer ownership checks
+            models.Index(fields=["employer_id"], name="job_employer_idx"),
+        ]
 
     job_id = models.UUIDField(
         primary_key=True, default=uuid.uuid4, editable=False, null=False
@@ -62,6 +100,18 @@ class Job(models.Model):
     updated_at = models.DateTimeField(auto_now=True)  # update timestamp on every save()
     employer_id = models.UUIDField(null=False, editable=True, default=None)
 
+    # Applicant counters, kept in sync with tbl_applicants by
+    # apps.jobs.utils.applicant_counters in the same transaction as the
+    # write, so listings don't have to aggregate tbl_applicants.
+    # `manage.py rebuild_applicant_counts` recomputes them from scratch.
+    applicants_count = models.IntegerField(default=0, null=False)
+    applied_count = models.IntegerField(default=0, null=False)
+    under_reviewed_count = models.IntegerField(default=0, null=False)
+    shortlisted_count = models.IntegerField(default=0, null=False)
+    accepted_count = models.IntegerField(default=0, null=False)
+    rejected_count = models.IntegerField(default=0, null=False)
+    on_hold_count = models.IntegerField(default=0, null=False)
+
     def __str__(self):
         return self.job_role
 
@@ -76,6 +126,13 @@ class User(models.Model):
 
     class Meta:
         db_table = values.DB_TABLE_USER_PROFILE
+        indexes = [
+            # used by the cursor pagination ordering
+            models.Index(fields=["created_at", "user_id"], name="user_created_at_idx"),
+            # employer checks (UserTypeCheck.is_user_employer)
+            models.Index(fields=["user_id", "user_type"], name="user_id_user_type_idx"),
+            # User(company) lookups use the index Django creates for the FK
+        ]
 
     user_id = models.UUIDField(
         primary_key=True, default=None, editable=False, null=False
@@ -93,6 +150,9 @@ class User(models.Model):
     cover_letter = models.FileField(upload_to="cover_letter/", null=True)
     company = models.ForeignKey(Company, on_delete=models.CASCADE, null=True, default=None)
     user_type = models.CharField(max_length=15, default=None)
+    # default (not auto_now_add) so fixtures without a timestamp still load
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = UpdatedAtField()
 
     def __str__(self):
         return self.name
@@ -115,10 +175,33 @@ class Applicants(models.Model):
 
     class Meta:
         db_table = "tbl_applicants"
+        indexes = [
+            # used by the paginated /user/{pk}/jobs listing
+            models.Index(
+                fields=["user", "created_at"], name="applicants_user_created_idx"
+            ),
+            # application lookups by user (and job), the lookups by job use
+            # the index of the unique (job, user) constraint below
+            models.Index(fields=["user", "job"], name="applicants_user_job_idx"),
+            # employer application updates
+            models.Index(
+                fields=["employer_id", "status"], name="applicants_employer_status_idx"
+            ),
+        ]
+        constraints = [
+            # a user can apply for a job only once
+            models.UniqueConstraint(
+                fields=["job", "user"], name="applicants_unique_job_user"
+            ),
+        ]
 
     job = models.ForeignKey(Job, on_delete=models.CASCADE, null=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=False)
-    status = models.CharField(max_length=30, choices=STATUS_CHOICES, default="applied")
+    status = models.CharField(
+        max_length=30,
+        choices=STATUS_CHOICES,
+        default=values.APPLICATION_STATUS_APPLIED,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     resume = models.FileField(upload_to="resume/", null=True, blank=True)
     cover_letter = models.FileField(upload_to="cover_letters/", null=True, blank=True)
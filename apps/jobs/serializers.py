@@ -6,25 +6,57 @@ Note: the argumment `read_only=True` allows the field to only present
 in the output. However at the time of crud opertions, it won't be present.
 """
 
+import datetime
+import functools
 import uuid
 
-from rest_framework import serializers
+from django.db.models import QuerySet
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from rest_framework.utils.serializer_helpers import ReturnList
 
+from apps.jobs.constants import values
 from apps.jobs.models import Applicants, Company, Job, User
 
 # read_only=True allows the field to only present in the output
 # however at the time of crud opertions, it won't be present.
 
 
-class JobSerializer(serializers.ModelSerializer):
+class SparseFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that only outputs the fields listed in its context
+    under "fields" (see utils.mixins.SparseFieldsMixin), or all of them
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get("fields")
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class JobSerializer(SparseFieldsModelSerializer):
     """Job object serializer class"""
 
     class Meta:
         model = Job
         fields = "__all__"
+        # the applicant counters are only maintained by the apply flow
+        read_only_fields = values.APPLICANT_COUNTER_FIELDS
+
+
+class JobImportSerializer(JobSerializer):
+    """
+    Job serializer used by the bulk imports, the company is only parsed
+    as a UUID here, its existence is checked once per chunk of rows
+    (apps.jobs.utils.job_import) instead of with one query per row.
+    """
+
+    company = serializers.UUIDField(source="company_id")
 
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(SparseFieldsModelSerializer):
     """Company object serializer class"""
 
     class Meta:
@@ -32,7 +64,7 @@ class CompanySerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsModelSerializer):
     """User object serializer class"""
 
     class Meta:
@@ -46,3 +78,190 @@ class ApplicantsSerializer(serializers.ModelSerializer):
     class Meta:
         model = Applicants
         fields = "__all__"
+
+
+class ValuesListSerializer:
+    """
+    Read-only list serializer working from `.values()` rows.
+
+    It gives the same data as `model_serializer_class(rows, many=True).data`
+    without building a model instance per row or running the DRF fields:
+    the converter of every field is found once, and the values the database
+    already returns in their output form (strings, numbers, booleans,
+    foreign keys) are copied as they are.
+    """
+
+    model_serializer_class = None
+
+    # DRF fields whose to_representation doesn't change a database value
+    PASSTHROUGH_FIELDS = (
+        serializers.BooleanField,
+        serializers.CharField,
+        serializers.IntegerField,
+    )
+
+    def __init__(self, rows, context=None):
+        self.context = context or {}
+        if isinstance(rows, QuerySet):
+            rows = self.values(rows, fields=self.context.get("fields"))
+        self.rows = rows
+
+    @classmethod
+    def values(cls, queryset, fields=None, extra=()):
+        """
+        queryset.values() with the columns needed by this serializer, or
+        only by the given fields (output names), plus the `extra` columns
+        """
+
+        columns = [
+            attname
+            for name, attname, _ in cls.get_fields()
+            if fields is None or name in fields
+        ]
+        columns += [column for column in extra if column not in columns]
+        return queryset.values(*columns)
+
+    @classmethod
+    def get_fields(cls):
+        """
+        return [(output name, column attname, converter)], the converter
+        is None for the values copied as they are
+        """
+
+        if "_fields" not in cls.__dict__:
+            serializer = cls.model_serializer_class()
+            model = serializer.Meta.model
+            fields = []
+            for name, field in serializer.fields.items():
+                if field.write_only:
+                    continue
+                model_field = model._meta.get_field(field.source)
+                fields.append((name, model_field.attname, cls.get_converter(field)))
+            cls._fields = fields
+        return cls._fields
+
+    @classmethod
+    def get_converter(cls, field):
+        """return the converter of a serializer field's non-null values"""
+
+        if isinstance(field, cls.PASSTHROUGH_FIELDS):
+            return None
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            return None if field.pk_field is None else field.to_representation
+        if isinstance(field, serializers.UUIDField):
+            return (
+                str if field.uuid_format == "hex_verbose" else field.to_representation
+            )
+        if isinstance(field, serializers.FileField):
+            return FileUrlConverter(field)
+
+        if isinstance(field, serializers.DateTimeField):
+            if is_iso_format(field, api_settings.DATETIME_FORMAT) and not hasattr(
+                field, "timezone"
+            ):
+                return DateTimeConverter(field)
+        elif isinstance(field, serializers.DateField):
+            if is_iso_format(field, api_settings.DATE_FORMAT):
+                return datetime.date.isoformat
+        return field.to_representation
+
+    def get_converters(self):
+        """
+        get_fields (only the context's "fields" if given), with the
+        converters that depend on the context bound
+        """
+
+        fields = self.context.get("fields")
+        converters = []
+        for name, attname, converter in self.get_fields():
+            if fields is not None and name not in fields:
+                continue
+            if hasattr(converter, "bind"):
+                converter = converter.bind(self.context)
+            converters.append((name, attname, converter))
+        return converters
+
+    @property
+    def data(self):
+        if not hasattr(self, "_data"):
+            converters = self.get_converters()
+            data = []
+            for row in self.rows:
+                item = {}
+                for name, attname, converter in converters:
+                    value = row[attname]
+                    if converter is not None and value is not None:
+                        value = converter(value)
+                    item[name] = value
+                data.append(item)
+            self._data = ReturnList(data, serializer=self)
+        return self._data
+
+
+class FileUrlConverter:
+    """FileField converter, its url depends on the request"""
+
+    def __init__(self, field):
+        self.use_url = getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL)
+        self.storage = field.parent.Meta.model._meta.get_field(field.source).storage
+
+    def bind(self, context):
+        if not self.use_url:
+            return lambda name: name or None
+        return functools.partial(file_url, self.storage, context.get("request"))
+
+
+class DateTimeConverter:
+    """
+    DateTimeField converter (ISO 8601 output), the current timezone is
+    looked up once per serialization instead of once per value
+    """
+
+    def __init__(self, field):
+        self.field = field
+
+    def bind(self, context):
+        return functools.partial(
+            datetime_to_iso, self.field.default_timezone(), self.field.to_representation
+        )
+
+
+def is_iso_format(field, default_format):
+    output_format = getattr(field, "format", default_format)
+    return isinstance(output_format, str) and output_format.lower() == ISO_8601
+
+
+def file_url(storage, request, name):
+    """FileField output of a file name, like serializers.FileField"""
+
+    if not name:
+        return None
+    url = storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def datetime_to_iso(field_timezone, to_representation, value):
+    """DateTimeField output of a datetime, like serializers.DateTimeField"""
+
+    if field_timezone is None or value.utcoffset() is None:
+        return to_representation(value)
+    value = value.astimezone(field_timezone).isoformat()
+    return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+
+class JobListSerializer(ValuesListSerializer):
+    """Read-only Job serializer for the lists"""
+
+    model_serializer_class = JobSerializer
+
+
+class CompanyListSerializer(ValuesListSerializer):
+    """Read-only Company serializer for the lists"""
+
+    model_serializer_class = CompanySerializer
+
+
+class UserListSerializer(ValuesListSerializer):
+    """Read-only User serializer for the lists"""
+
+    model_serializer_class = UserSerializer
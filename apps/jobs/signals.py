@@ -0,0 +1,48 @@
+"""
+Signal handlers that keep the job response cache (apps.jobs.utils.cache),
+the list versions of the conditional GETs (apps.jobs.utils.conditional),
+the applicant counters of the jobs (apps.jobs.utils.applicant_counters)
+and the employer checks (apps.jobs.utils.user_permissions) in sync with
+the models.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.jobs.constants import values
+from apps.jobs.models import Applicants, Company, Job, User
+from apps.jobs.utils import applicant_counters
+from apps.jobs.utils import cache as job_cache
+from apps.jobs.utils.conditional import bump_table_version
+from apps.jobs.utils.user_permissions import employer_cache
+
+
+@receiver([post_save, post_delete], sender=Job)
+def invalidate_job_cache(sender, instance, **kwargs):
+    job_cache.invalidate_job_on_commit(instance.job_id)
+
+
+@receiver([post_save, post_delete], sender=Applicants)
+def invalidate_applicant_job_cache(sender, instance, **kwargs):
+    # the job detail/list embed the applicant counters
+    job_cache.invalidate_job_on_commit(instance.job_id)
+
+
+@receiver(post_delete, sender=Applicants)
+def uncount_deleted_application(sender, instance, **kwargs):
+    applicant_counters.remove_application(instance.job_id, instance.status)
+
+
+@receiver([post_save, post_delete], sender=Company)
+def invalidate_company_job_cache(sender, instance, **kwargs):
+    # the company filter of the job lists; a deleted company also
+    # deletes its jobs, which invalidate their own details
+    job_cache.invalidate_job_on_commit()
+    bump_table_version(values.DB_TABLE_COMPANY)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_employer_cache(sender, instance, **kwargs):
+    # the user_type may have changed
+    employer_cache.pop(str(instance.user_id))
+    bump_table_version(values.DB_TABLE_USER_PROFILE)
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from apps.jobs.utils import cache as job_cache
+
+
+@override_settings(
+    JOBS_CACHE_TIMEOUT=60, JOBS_CACHE_STALE_GRACE=30, JOBS_CACHE_LOCK_TIMEOUT=5
+)
+class GetOrBuildTestCase(SimpleTestCase):
+    key = "tests:get_or_build"
+
+    def setUp(self):
+        cache.clear()
+        job_cache.reset_cache_stats()
+
+    def set_stale(self, value):
+        cache.set(self.key, (value, time.time() - 1), 30)
+
+    def test_build_once_then_hit(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            return "value"
+
+        self.assertEqual(job_cache.get_or_build(self.key, build), "value")
+        self.assertEqual(job_cache.get_or_build(self.key, build), "value")
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(
+            job_cache.cache_stats(), {"hits": 1, "misses": 1, "stale": 0, "waits": 0}
+        )
+
+    def test_concurrent_misses_build_once(self):
+        builds = []
+        building = threading.Event()
+        results = []
+
+        def build():
+            builds.append(1)
+            building.set()
+            time.sleep(0.2)
+            return "value"
+
+        def get():
+            results.append(job_cache.get_or_build(self.key, build))
+
+        threads = [threading.Thread(target=get) for _ in range(5)]
+        threads[0].start()
+        building.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(results, ["value"] * 5)
+        self.assertEqual(job_cache.cache_stats()["waits"], 4)
+
+    def test_stale_value_served_while_rebuilding(self):
+        self.set_stale("old")
+        job_cache._acquire_lock(self.key)
+
+        value = job_cache.get_or_build(self.key, lambda: self.fail("rebuilt"))
+        self.assertEqual(value, "old")
+        self.assertEqual(job_cache.cache_stats()["stale"], 1)
+
+    def test_stale_value_rebuilt_by_lock_holder(self):
+        self.set_stale("old")
+
+        self.assertEqual(job_cache.get_or_build(self.key, lambda: "new"), "new")
+        self.assertEqual(job_cache.get_or_build(self.key, lambda: "newer"), "new")
+
+    def test_lock_released_when_build_fails(self):
+        def build():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            job_cache.get_or_build(self.key, build)
+        self.assertIsNone(cache.get(job_cache.LOCK_KEY.format(self.key)))
+        self.assertEqual(job_cache.get_or_build(self.key, lambda: "value"), "value")
+
+    def test_fill_racing_invalidation_not_served(self):
+        job_id = "00000000-0000-0000-0000-000000000001"
+
+        def build_then_write():
+            # the row was read, then written (and invalidated) by another
+            # request before this one stores it
+            job_cache.invalidate_job(job_id)
+            return "old"
+
+        key = job_cache.job_detail_key(job_id)
+        self.assertEqual(job_cache.get_or_build(key, build_then_write), "old")
+
+        new_key = job_cache.job_detail_key(job_id)
+        self.assertNotEqual(new_key, key)
+        self.assertEqual(job_cache.get_or_build(new_key, lambda: "new"), "new")
@@ -0,0 +1,180 @@
+import csv
+import datetime
+import gzip
+import json
+import os
+import tempfile
+import uuid
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from apps.jobs.models import Applicants, Company, Job, User
+
+
+class RebuildApplicantCountsTestCase(TestCase):
+    def setUp(self):
+        company = Company.objects.create(
+            name="Test Company", location="Test Location", about="Test Company"
+        )
+        self.job = Job.objects.create(
+            job_role="Software Developer",
+            company=company,
+            location="Test Location",
+            post_date=datetime.date(2023, 10, 1),
+            employer_id=uuid.uuid4(),
+        )
+        for status in ("applied", "applied", "rejected"):
+            user = User.objects.create(
+                user_id=uuid.uuid4(),
+                name="Test User",
+                email="test@example.com",
+                address="Test Address",
+                user_type="employee",
+            )
+            Applicants.objects.create(
+                job=self.job,
+                user=user,
+                status=status,
+                employer_id=self.job.employer_id,
+            )
+
+    def test_verify_reports_wrong_counters(self):
+        with self.assertRaises(CommandError):
+            call_command("rebuild_applicant_counts", "--verify", stdout=StringIO())
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applicants_count, 0)
+
+    def test_rebuild_fixes_counters(self):
+        call_command("rebuild_applicant_counts", stdout=StringIO())
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applicants_count, 3)
+        self.assertEqual(self.job.applied_count, 2)
+        self.assertEqual(self.job.rejected_count, 1)
+        call_command("rebuild_applicant_counts", "--verify", stdout=StringIO())
+
+
+class ImportJobsTestCase(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(
+            name="Test Company", location="Test Location", about="Test Company"
+        )
+        self.employer = User.objects.create(
+            user_id=uuid.uuid4(),
+            name="Test Employer",
+            email="test@example.com",
+            address="Test Address",
+            user_type="employer",
+        )
+
+    def import_file(self, content, suffix):
+        with tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False) as file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_jobs", file.name, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_ndjson(self):
+        rows = [
+            {
+                "job_role": f"Developer {n}",
+                "company": str(self.company.company_id),
+                "location": "Test Location",
+                "post_date": "2023-10-01",
+                "employer_id": str(self.employer.user_id),
+            }
+            for n in range(3)
+        ]
+        rows[1]["company"] = str(uuid.uuid4())
+        rows[2]["employer_id"] = str(uuid.uuid4())
+
+        stdout, stderr = self.import_file(
+            "\n".join(json.dumps(row) for row in rows), ".ndjson"
+        )
+        self.assertIn("1 jobs created, 2 rows failed", stdout)
+        self.assertIn("row 2: ", stderr)
+        self.assertIn("row 3: ", stderr)
+        self.assertEqual(
+            list(Job.objects.values_list("job_role", flat=True)), ["Developer 0"]
+        )
+
+    def test_import_csv(self):
+        content = (
+            "job_role,company,location,post_date,posted,employer_id\n"
+            f"Developer,{self.company.company_id},Pune,2023-10-01,true,"
+            f"{self.employer.user_id}\n"
+            f"Tester,{self.company.company_id},Pune,not-a-date,,"
+            f"{self.employer.user_id}\n"
+        )
+
+        stdout, stderr = self.import_file(content, ".csv")
+        self.assertIn("1 jobs created, 1 rows failed", stdout)
+        self.assertIn("post_date", stderr)
+        job = Job.objects.get()
+        self.assertEqual(job.job_role, "Developer")
+        self.assertTrue(job.posted)
+
+
+class ExportApplicantsTestCase(TestCase):
+    def setUp(self):
+        company = Company.objects.create(
+            name="Test Company", location="Test Location", about="Test Company"
+        )
+        self.employer_id = uuid.uuid4()
+        for job_role in ("Developer", "Tester"):
+            job = Job.objects.create(
+                job_role=job_role,
+                company=company,
+                location="Test Location",
+                post_date=datetime.date(2023, 10, 1),
+                employer_id=self.employer_id,
+            )
+            for n in range(3):
+                user = User.objects.create(
+                    user_id=uuid.uuid4(),
+                    name=f"User {n}",
+                    email="test@example.com",
+                    address="Test Address",
+                    user_type="employee",
+                )
+                Applicants.objects.create(
+                    job=job, user=user, employer_id=self.employer_id
+                )
+        self.job = job
+
+    def export(self, *args):
+        with tempfile.NamedTemporaryFile(delete=False) as file:
+            pass
+        self.addCleanup(os.remove, file.name)
+
+        call_command("export_applicants", *args, "--output", file.name)
+        with open(file.name, "rb") as file:
+            return file.read()
+
+    def test_export_job_csv(self):
+        content = self.export("--job", str(self.job.job_id), "--chunk-size", "2")
+
+        rows = list(csv.DictReader(content.decode().splitlines()))
+        self.assertEqual([row["name"] for row in rows], ["User 0", "User 1", "User 2"])
+        self.assertEqual({row["job_role"] for row in rows}, {"Tester"})
+        self.assertEqual(rows[0]["resume"], "")
+
+    def test_export_employer_ndjson_gzip(self):
+        content = self.export(
+            "--employer", str(self.employer_id), "--format", "ndjson", "--gzip"
+        )
+
+        rows = [json.loads(line) for line in gzip.decompress(content).splitlines()]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]["status"], "applied")
+        self.assertIsNone(rows[0]["resume"])
+
+    def test_export_invalid_id(self):
+        with self.assertRaises(CommandError):
+            call_command("export_applicants", "--job", "not-an-id")
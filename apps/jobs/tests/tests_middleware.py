@@ -0,0 +1,100 @@
+import gzip
+import unittest
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from null_jobs_backend import middleware
+from null_jobs_backend.middleware import CompressionMiddleware, choose_encoding
+
+BODY = (
+    b'{"data": [' + b",".join(b'{"job_role": "Developer"}' for _ in range(200)) + b"]}"
+)
+
+
+@override_settings(COMPRESSION_MIN_SIZE=1024)
+class CompressionMiddlewareTestCase(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def process(self, response, accept_encoding="gzip, deflate", **extra):
+        request = self.factory.get(
+            "/jobs/", HTTP_ACCEPT_ENCODING=accept_encoding, **extra
+        )
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, content=BODY, **kwargs):
+        return HttpResponse(content, content_type="application/json", **kwargs)
+
+    def test_gzip(self):
+        response = self.json_response()
+        response["ETag"] = '"abc"'
+        response = self.process(response)
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["ETag"], 'W/"abc"')
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(gzip.decompress(response.content), BODY)
+
+    def test_small_response(self):
+        response = self.process(self.json_response(BODY[:1000]))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_content_type(self):
+        response = self.process(HttpResponse(BODY, content_type="image/png"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_already_encoded(self):
+        response = self.json_response()
+        response["Content-Encoding"] = "identity"
+        self.assertEqual(self.process(response).content, BODY)
+
+    def test_not_accepted(self):
+        for accept_encoding in ("", "deflate", "gzip;q=0"):
+            response = self.process(self.json_response(), accept_encoding)
+            self.assertFalse(response.has_header("Content-Encoding"))
+            self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_streaming(self):
+        chunks = [BODY[:10], BODY[10:500], BODY[500:]]
+        response = self.process(
+            StreamingHttpResponse(iter(chunks), content_type="application/json")
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), BODY)
+
+    def test_choose_encoding(self):
+        available = "br" if middleware.brotli is not None else "gzip"
+        self.assertEqual(choose_encoding("gzip, deflate, br"), available)
+        self.assertEqual(choose_encoding("br;q=0.5, gzip"), "gzip")
+        self.assertEqual(choose_encoding("*"), available)
+        self.assertEqual(
+            choose_encoding("*, gzip;q=0"), "br" if middleware.brotli else None
+        )
+        self.assertIsNone(choose_encoding("identity"))
+        self.assertEqual(choose_encoding("br, gzip", allow_brotli=False), "gzip")
+        self.assertIsNone(choose_encoding("br", allow_brotli=False))
+
+    def test_secrets_gzipped(self):
+        # brotli would be chosen for "br, gzip" without the secrets
+        response = self.json_response()
+        response.set_cookie("sessionid", "secret")
+        self.assertEqual(self.process(response, "br, gzip")["Content-Encoding"], "gzip")
+
+        response = self.process(self.json_response(), "br", CSRF_COOKIE_USED=True)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    @unittest.skipIf(middleware.brotli is None, "Brotli isn't installed")
+    def test_brotli(self):
+        response = self.process(self.json_response(), "gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(middleware.brotli.decompress(response.content), BODY)
+
+        response = self.process(
+            StreamingHttpResponse(iter([BODY[:10], BODY[10:]])), "br"
+        )
+        content = b"".join(response.streaming_content)
+        self.assertEqual(middleware.brotli.decompress(content), BODY)
@@ -1,6 +1,12 @@
 # tests.py
+import datetime
+import uuid
+
 from apps.jobs import *
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
 from apps.jobs.models import *
 from apps.jobs.serializers import *
 
@@ -139,3 +145,69 @@ class ApplicantsSerializerTestCase(TestCase):
         # Ensure read-only field employer_id is not used for deserialization
         self.assertFalse(serializer.is_valid())
         self.assertNotIn("employer_id", serializer.validated_data)
+
+
+class ValuesListSerializerTestCase(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(
+            name="Test Company", location="Test Location", about="Test Company"
+        )
+        self.other_company = Company.objects.create(
+            name="Café Company", location="Elsewhere", about="Other"
+        )
+        for number in range(3):
+            Job.objects.create(
+                job_role=f"Developer {number}",
+                company=self.company if number else self.other_company,
+                description="Test description",
+                location="Test Location",
+                post_date=datetime.date(2023, 10, number + 1),
+                posted=bool(number % 2),
+                experience=number,
+                employer_id=uuid.uuid4(),
+            )
+        User.objects.create(
+            user_id=uuid.uuid4(),
+            name="Test User",
+            email="test@example.com",
+            address="Test Address",
+            user_type="employee",
+            resume="resume/resume.pdf",
+            profile_picture="",
+            company=self.company,
+        )
+        User.objects.create(
+            user_id=uuid.uuid4(),
+            name="Other User",
+            email="other@example.com",
+            address="Test Address",
+            user_type="employer",
+        )
+
+    def assert_same_output(self, model_serializer_class, list_serializer_class):
+        request = APIRequestFactory().get("/")
+        queryset = model_serializer_class.Meta.model.objects.order_by("created_at")
+        for context in ({}, {"request": request}):
+            for current_timezone in ("UTC", "Asia/Kolkata"):
+                with timezone.override(current_timezone):
+                    expected = model_serializer_class(
+                        queryset, many=True, context=context
+                    ).data
+                    data = list_serializer_class(queryset, context=context).data
+                self.assertEqual(
+                    JSONRenderer().render(data), JSONRenderer().render(expected)
+                )
+
+    def test_job_list_serializer(self):
+        self.assert_same_output(JobSerializer, JobListSerializer)
+
+    def test_company_list_serializer(self):
+        self.assert_same_output(CompanySerializer, CompanyListSerializer)
+
+    def test_user_list_serializer(self):
+        self.assert_same_output(UserSerializer, UserListSerializer)
+
+    def test_no_instances_built(self):
+        rows = JobListSerializer.values(Job.objects.all())
+        self.assertTrue(all(isinstance(row, dict) for row in rows))
+        self.assertEqual(len(JobListSerializer(rows).data), 3)
@@ -0,0 +1,1070 @@
+import csv
+import datetime
+import gzip
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User as user_auth
+from apps.accounts.views import GenerateToken
+from apps.jobs.models import Applicants, Company, Job, User
+from apps.jobs.utils import applicant_counters
+from apps.jobs.utils import cache as job_cache
+from apps.jobs.utils.user_permissions import UserTypeCheck
+
+
+class JobViewSetsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.company = Company.objects.create(
+            name="Test Company", location="Test Location", about="Test Company"
+        )
+        self.employer_id = self.create_employer().user_id
+        self.login(self.employer_id)
+
+    def create_employer(self, user_type="employer"):
+        """profile with its tbl_user_auth user, to log in with"""
+
+        auth_user = user_auth.objects.create_user(
+            email=f"{uuid.uuid4().hex}@example.com",
+            name="Test Employer",
+            user_type=user_type.title(),
+            password="password",
+        )
+        return self.create_user(user_type=user_type, user_id=auth_user.id)
+
+    def login(self, user_id):
+        self.client.force_authenticate(user=user_auth.objects.get(id=user_id))
+
+    def create_job(self, job_role="Software Developer"):
+        return Job.objects.create(
+            job_role=job_role,
+            company=self.company,
+            description="Test description",
+            location="Test Location",
+            post_date=datetime.date(2023, 10, 1),
+            posted=True,
+            experience=2,
+            employer_id=self.employer_id,
+        )
+
+    def create_user(self, user_type="employee", **kwargs):
+        kwargs.setdefault("user_id", uuid.uuid4())
+        return User.objects.create(
+            name="Test User",
+            email="test@example.com",
+            address="Test Address",
+            user_type=user_type,
+            **kwargs,
+        )
+
+    def create_applicant(self, job, user=None):
+        applicant = Applicants.objects.create(
+            job=job, user=user or self.create_user(), employer_id=self.employer_id
+        )
+        applicant_counters.add_application(job.job_id)
+        return applicant
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/jobs/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_list_number_of_applicants(self):
+        job = self.create_job()
+        self.create_applicant(job)
+        self.create_applicant(job)
+        self.create_job("Test Developer")
+
+        response = self.client.get("/jobs/")
+        counts = {
+            data["job_role"]: data["Number of Applicants"]
+            for data in response.data["data"]["results"]
+        }
+        self.assertEqual(counts, {"Software Developer": 2, "Test Developer": 0})
+
+    def test_list_query_count_is_constant(self):
+        self.create_applicant(self.create_job())
+        queries_for_one_job = self.count_list_queries()
+
+        for _ in range(5):
+            self.create_applicant(self.create_job())
+        self.assertEqual(self.count_list_queries(), queries_for_one_job)
+
+    def test_list_cursor_pagination(self):
+        for n in range(3):
+            self.create_job(f"Developer {n}")
+
+        response = self.client.get("/jobs/", {"page_size": 2})
+        page = response.data["data"]
+        self.assertEqual(
+            [data["job_role"] for data in page["results"]],
+            ["Developer 2", "Developer 1"],
+        )
+        self.assertIsNone(page["previous"])
+
+        response = self.client.get(page["next"])
+        page = response.data["data"]
+        self.assertEqual(
+            [data["job_role"] for data in page["results"]], ["Developer 0"]
+        )
+        self.assertIsNone(page["next"])
+
+    @override_settings(STREAM_CHUNK_SIZE=2)
+    def test_list_stream(self):
+        job = self.create_job("Developer 0")
+        self.create_applicant(job)
+        for n in range(1, 5):
+            self.create_job(f"Developer {n}")
+
+        response = self.client.get("/jobs/", {"stream": "1"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        # five jobs in chunks of two: three queries, the last one is short
+        with self.assertNumQueries(3):
+            body = json.loads(b"".join(response.streaming_content))
+
+        self.assertEqual(
+            [data["job_role"] for data in body["data"]],
+            [f"Developer {n}" for n in range(4, -1, -1)],
+        )
+        self.assertEqual(body["data"][-1]["Number of Applicants"], 1)
+
+    def test_list_stream_filtered_fields(self):
+        self.create_job("Developer 0")
+        self.create_job("Developer 1").delete()
+
+        response = self.client.get(
+            "/jobs/", {"stream": "true", "fields": "job_role", "location": "Remote"}
+        )
+        body = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(body, {"data": []})
+
+        response = self.client.get("/jobs/", {"stream": "true", "fields": "job_role"})
+        body = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(body, {"data": [{"job_role": "Developer 0"}]})
+
+    def test_bulk_create(self):
+        jobs = [
+            {
+                "job_role": f"Developer {n}",
+                "company": str(self.company.company_id),
+                "location": "Test Location",
+                "post_date": "2023-10-01",
+            }
+            for n in range(3)
+        ]
+        del jobs[1]["post_date"]
+
+        response = self.client.post(
+            "/jobs/bulk_create/",
+            {"employer_id": str(self.employer_id), "jobs": jobs},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["data"]["created"], 2)
+        self.assertEqual(
+            [error["row"] for error in response.data["data"]["errors"]], [2]
+        )
+        self.assertEqual(Job.objects.filter(employer_id=self.employer_id).count(), 2)
+
+    def test_bulk_create_not_employer(self):
+        self.login(self.create_employer(user_type="employee").user_id)
+
+        response = self.client.post("/jobs/bulk_create/", {"jobs": [{}]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_employer_actions_need_authentication(self):
+        job = self.create_job()
+        self.create_applicant(job)
+        self.client.force_authenticate(user=None)
+
+        # the employer_id of the body isn't trusted
+        data = {"employer_id": str(self.employer_id)}
+        for method, url, extra in (
+            ("post", "/jobs/", {"job_role": "Developer"}),
+            ("post", "/jobs/bulk_create/", {"jobs": [{}]}),
+            ("post", f"/jobs/{job.job_id}/update_application/", {"status": "rejected"}),
+            ("get", f"/jobs/{job.job_id}/applicants/export/", {}),
+            ("get", "/jobs/applicants/export/", {}),
+        ):
+            response = getattr(self.client, method)(url, {**data, **extra})
+            self.assertIn(
+                response.status_code,
+                (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN),
+                url,
+            )
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertEqual(Applicants.objects.get().status, "applied")
+
+    def test_retrieve_number_of_applicants(self):
+        job = self.create_job()
+        self.create_applicant(job)
+
+        # the version stamp (ETag) and the job
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/jobs/{job.job_id}/")
+        self.assertEqual(response.data["data"][0]["Number of Applicants"], 1)
+
+    def test_retrieve_is_cached_until_applied(self):
+        job = self.create_job()
+        url = f"/jobs/{job.job_id}/"
+        self.client.get(url)
+
+        job_cache.reset_cache_stats()
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.data["data"][0]["Number of Applicants"], 0)
+        self.assertEqual(job_cache.cache_stats()["hits"], 2)
+        self.assertEqual(job_cache.cache_stats()["misses"], 0)
+
+        self.create_applicant(job)
+        response = self.client.get(url)
+        self.assertEqual(response.data["data"][0]["Number of Applicants"], 1)
+
+    def test_list_is_cached_per_filter(self):
+        self.create_job()
+        self.client.get("/jobs/")
+
+        with self.assertNumQueries(0):
+            self.client.get("/jobs/")
+        response = self.client.get("/jobs/", {"location": "Elsewhere"})
+        self.assertEqual(response.data["data"]["results"], [])
+
+    def test_list_cache_invalidated_on_writes(self):
+        job = self.create_job()
+        self.client.get("/jobs/")
+
+        self.create_job("Test Developer")
+        response = self.client.get("/jobs/")
+        self.assertEqual(len(response.data["data"]["results"]), 2)
+
+        # queryset.update doesn't send post_save, the counters invalidate
+        self.create_applicant(job)
+        applicant_counters.change_application_status(
+            Applicants.objects.filter(job=job), "shortlisted"
+        )
+        response = self.client.get("/jobs/")
+        shortlisted = {
+            data["job_role"]: data["shortlisted_count"]
+            for data in response.data["data"]["results"]
+        }
+        self.assertEqual(shortlisted, {"Software Developer": 1, "Test Developer": 0})
+
+        job.delete()
+        response = self.client.get("/jobs/")
+        self.assertEqual(len(response.data["data"]["results"]), 1)
+
+    def test_apply_updates_applicant_counters(self):
+        job = self.create_job()
+        user = self.create_user(
+            resume="resume/resume.pdf", cover_letter="cover_letter/letter.pdf"
+        )
+
+        response = self.client.post(
+            f"/jobs/{job.job_id}/apply/", {"user_id": str(user.user_id)}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        job.refresh_from_db()
+        self.assertEqual(job.applicants_count, 1)
+        self.assertEqual(job.applied_count, 1)
+
+    def test_apply_twice(self):
+        job = self.create_job()
+        user = self.create_user(
+            resume="resume/resume.pdf", cover_letter="cover_letter/letter.pdf"
+        )
+        url = f"/jobs/{job.job_id}/apply/"
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(url, {"user_id": str(user.user_id)})
+        selects = [q for q in queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 1)
+
+        response = self.client.post(url, {"user_id": str(user.user_id)})
+        self.assertEqual(response.data["data"], "You have already applied for this Job")
+        self.assertEqual(Applicants.objects.filter(job=job, user=user).count(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.applicants_count, 1)
+
+    def test_apply_unknown_user(self):
+        job = self.create_job()
+
+        response = self.client.post(
+            f"/jobs/{job.job_id}/apply/", {"user_id": str(uuid.uuid4())}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["message"]["error"],
+            {"error": "This user-id doesn't exist"},
+        )
+
+    def test_deleted_applications_uncounted(self):
+        job = self.create_job()
+        application = self.create_applicant(job)
+        user = self.create_user()
+        self.create_applicant(job, user)
+        self.create_applicant(job)
+        applicant_counters.change_application_status(
+            Applicants.objects.filter(id=application.id), "shortlisted"
+        )
+        application.refresh_from_db()
+
+        application.delete()
+        # cascade delete of the user's applications
+        user.delete()
+
+        job.refresh_from_db()
+        self.assertEqual(
+            (job.applicants_count, job.applied_count, job.shortlisted_count),
+            (1, 1, 0),
+        )
+
+    def test_status_change_reads_jobs_before_applications(self):
+        job = self.create_job()
+        self.create_applicant(job)
+
+        with CaptureQueriesContext(connection) as queries:
+            applicant_counters.change_application_status(
+                Applicants.objects.filter(job=job), "shortlisted"
+            )
+        # same lock order as an apply: the job row, then the applications
+        tables = [
+            "job" if '"tbl_job"' in query["sql"] else "applicants"
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+        self.assertEqual(tables, ["applicants", "job", "applicants"])
+
+    def test_update_application_moves_status_counters(self):
+        job = self.create_job()
+        application = self.create_applicant(job)
+        self.create_applicant(job)
+
+        response = self.client.post(
+            f"/jobs/{job.job_id}/update_application/",
+            {"user_id": str(application.user_id), "status": "shortlisted"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        job.refresh_from_db()
+        self.assertEqual(job.applicants_count, 2)
+        self.assertEqual(job.applied_count, 1)
+        self.assertEqual(job.shortlisted_count, 1)
+
+    def test_update_application_requires_user_id(self):
+        job = self.create_job()
+        self.create_applicant(job)
+
+        for data in ({}, {"user_id": "not-a-uuid"}):
+            response = self.client.post(
+                f"/jobs/{job.job_id}/update_application/",
+                {"status": "shortlisted", **data},
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Applicants.objects.get().status, "applied")
+
+    def test_update_application_not_applied(self):
+        job, other_job = self.create_job(), self.create_job()
+        application = self.create_applicant(other_job)
+
+        response = self.client.post(
+            f"/jobs/{job.job_id}/update_application/",
+            {"user_id": str(application.user_id), "status": "shortlisted"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        application.refresh_from_db()
+        self.assertEqual(application.status, "applied")
+
+    def test_update_application_only_touches_this_job(self):
+        job, other_job = self.create_job(), self.create_job()
+        user = self.create_user()
+        self.create_applicant(job, user)
+        other_application = self.create_applicant(other_job, user)
+
+        self.client.post(
+            f"/jobs/{job.job_id}/update_application/",
+            {"user_id": str(user.user_id), "status": "accepted"},
+        )
+        other_application.refresh_from_db()
+        self.assertEqual(other_application.status, "applied")
+
+    def test_update_applications_in_bulk(self):
+        job, other_job = self.create_job(), self.create_job()
+        applications = [self.create_applicant(job) for _ in range(3)]
+        other_application = self.create_applicant(other_job)
+
+        response = self.client.post(
+            f"/jobs/{job.job_id}/update_applications/",
+            {
+                "employer_id": str(self.employer_id),
+                "applications": [
+                    {"application_id": applications[0].id, "status": "accepted"},
+                    {"user_id": str(applications[1].user_id), "status": "rejected"},
+                    # belongs to another job, so it isn't updated
+                    {"application_id": other_application.id, "status": "rejected"},
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"], {"updated": 2})
+
+        statuses = [
+            Applicants.objects.get(id=application.id).status
+            for application in [*applications, other_application]
+        ]
+        self.assertEqual(statuses, ["accepted", "rejected", "applied", "applied"])
+
+        job.refresh_from_db()
+        self.assertEqual(
+            (job.applied_count, job.accepted_count, job.rejected_count), (1, 1, 1)
+        )
+
+    def test_update_applications_validation(self):
+        job = self.create_job()
+        application = self.create_applicant(job)
+        url = f"/jobs/{job.job_id}/update_applications/"
+
+        for applications in (
+            [],
+            [{"application_id": application.id, "status": "hired"}],
+            [{"user_id": "not-a-uuid", "status": "accepted"}],
+            [
+                {"application_id": application.id, "status": "accepted"},
+                {"application_id": application.id, "status": "rejected"},
+            ],
+        ):
+            response = self.client.post(
+                url,
+                {"employer_id": str(self.employer_id), "applications": applications},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_update_applications_other_employer(self):
+        job = self.create_job()
+        self.login(self.create_employer().user_id)
+
+        response = self.client.post(
+            f"/jobs/{job.job_id}/update_applications/",
+            {
+                "applications": [{"application_id": 1, "status": "accepted"}],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
+    def test_update_application_rejects_unknown_status(self):
+        job = self.create_job()
+
+        response = self.client.post(
+            f"/jobs/{job.job_id}/update_application/",
+            {"employer_id": str(self.employer_id), "status": "hired"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_job_applicants_csv(self):
+        job = self.create_job()
+        for _ in range(3):
+            self.create_applicant(job)
+        self.create_applicant(self.create_job("Test Developer"))
+
+        response = self.client.get(
+            f"/jobs/{job.job_id}/applicants/export/",
+            {"employer_id": str(self.employer_id)},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn(".csv", response["Content-Disposition"])
+
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row["job_id"] for row in rows}, {str(job.job_id)})
+        self.assertEqual(rows[0]["email"], "test@example.com")
+
+    def test_export_csv_neutralises_formulas(self):
+        job = self.create_job()
+        user = self.create_user()
+        User.objects.filter(user_id=user.user_id).update(
+            name='=HYPERLINK("http://example.com")', address="-1+1"
+        )
+        self.create_applicant(job, user)
+
+        response = self.client.get(f"/jobs/{job.job_id}/applicants/export/")
+        content = b"".join(response.streaming_content).decode()
+        row = next(csv.DictReader(content.splitlines()))
+        self.assertEqual(row["name"], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(row["address"], "'-1+1")
+        self.assertEqual(row["email"], "test@example.com")
+
+        # the JSON export keeps the values as they are
+        response = self.client.get(
+            f"/jobs/{job.job_id}/applicants/export/", {"output": "ndjson"}
+        )
+        row = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(row["address"], "-1+1")
+
+    def test_export_job_applicants_other_employer(self):
+        job = self.create_job()
+        self.login(self.create_employer().user_id)
+
+        response = self.client.get(f"/jobs/{job.job_id}/applicants/export/")
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
+    def test_export_employer_applicants_ndjson_gzip(self):
+        self.create_applicant(self.create_job())
+        self.create_applicant(self.create_job("Test Developer"))
+
+        response = self.client.get(
+            "/jobs/applicants/export/",
+            {"employer_id": str(self.employer_id), "output": "ndjson", "gzip": "1"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn(".ndjson.gz", response["Content-Disposition"])
+
+        content = gzip.decompress(b"".join(response.streaming_content))
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(
+            sorted(row["job_role"] for row in rows),
+            ["Software Developer", "Test Developer"],
+        )
+
+    def test_export_applicants_validation(self):
+        self.login(self.create_employer(user_type="employee").user_id)
+        response = self.client.get("/jobs/applicants/export/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.login(self.employer_id)
+
+        response = self.client.get(
+            "/jobs/applicants/export/",
+            {"employer_id": str(self.employer_id), "output": "xml"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CompanyViewSetsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.companies = [
+            Company.objects.create(
+                name=f"Company {n}", location="Test Location", about="Test Company"
+            )
+            for n in range(3)
+        ]
+        for company in self.companies:
+            for n in range(3):
+                Job.objects.create(
+                    job_role=f"Developer {n}",
+                    company=company,
+                    location="Test Location",
+                    post_date=datetime.date(2023, 10, 1),
+                    employer_id=uuid.uuid4(),
+                )
+
+    def test_jobs_query_count_is_constant(self):
+        # one query for the page of companies, one for all of their jobs
+        with self.assertNumQueries(2):
+            response = self.client.get("/company/jobs/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = response.data["data"]["results"]
+        self.assertEqual(len(results), 3)
+        for company_data in results:
+            self.assertEqual(len(company_data["Jobs"]), 3)
+
+    def test_jobs_per_company_limit(self):
+        response = self.client.get("/company/jobs/", {"per_company": 2})
+
+        for company_data in response.data["data"]["results"]:
+            self.assertEqual(
+                [job["job_role"] for job in company_data["Jobs"]],
+                ["Developer 2", "Developer 1"],
+            )
+            for job in company_data["Jobs"]:
+                self.assertEqual(str(job["company_id"]), company_data["company_id"])
+
+    @override_settings(STREAM_CHUNK_SIZE=2)
+    def test_jobs_stream(self):
+        response = self.client.get("/company/jobs/", {"stream": "1"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = json.loads(b"".join(response.streaming_content))
+
+        self.assertEqual(
+            [company_data["name"] for company_data in body["data"]],
+            ["Company 2", "Company 1", "Company 0"],
+        )
+        for company_data in body["data"]:
+            self.assertEqual(len(company_data["Jobs"]), 3)
+
+    def test_jobs_invalid_per_company(self):
+        response = self.client.get("/company/jobs/", {"per_company": "all"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_users_paginated(self):
+        User.objects.create(
+            user_id=uuid.uuid4(),
+            name="Test User",
+            email="test@example.com",
+            address="Test Address",
+            company=self.companies[0],
+            user_type="employee",
+        )
+
+        response = self.client.get("/company/users/", {"page_size": 1})
+        page = response.data["data"]
+        self.assertEqual(len(page["results"]), 1)
+        self.assertIsNotNone(page["next"])
+        self.assertEqual(page["results"][0]["name"], "Company 2")
+        self.assertEqual(page["results"][0]["User"], [])
+
+
+class UserViewSetsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        company = Company.objects.create(
+            name="Test Company", location="Test Location", about="Test Company"
+        )
+        self.jobs = [
+            Job.objects.create(
+                job_role=f"Developer {n}",
+                company=company,
+                location="Test Location",
+                post_date=datetime.date(2023, 10, 1),
+                employer_id=uuid.uuid4(),
+            )
+            for n in range(3)
+        ]
+        self.users = [
+            User.objects.create(
+                user_id=uuid.uuid4(),
+                name=f"User {n}",
+                email="test@example.com",
+                address="Test Address",
+                user_type="employee",
+            )
+            for n in range(2)
+        ]
+
+    def apply(self, job, user, status="applied"):
+        Applicants.objects.create(
+            job=job, user=user, status=status, employer_id=job.employer_id
+        )
+
+    def test_update_ignores_timestamps_of_the_body(self):
+        user = self.users[0]
+        auth_user = user_auth.objects.create_user(
+            email="user@example.com",
+            name="User 0",
+            user_type="Job Seeker",
+            password="password",
+        )
+        User.objects.filter(user_id=user.user_id).update(user_id=auth_user.id)
+        token = GenerateToken.get_tokens_for_user(auth_user)["access"]
+
+        response = self.client.put(
+            f"/user/{auth_user.id}/",
+            {"name": "Renamed", "updated_at": "2020-01-01T00:00:00Z"},
+            format="json",
+            HTTP_ACCESSTOKEN=token,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user = User.objects.get(user_id=auth_user.id)
+        self.assertEqual(user.name, "Renamed")
+        self.assertGreater(user.updated_at.year, 2020)
+
+    def test_jobs_with_own_application_status(self):
+        self.apply(self.jobs[0], self.users[0], "shortlisted")
+        self.apply(self.jobs[0], self.users[1], "rejected")
+        self.apply(self.jobs[1], self.users[0], "on-hold")
+
+        # the version stamp (ETag) and the page
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/user/{self.users[0].user_id}/jobs/")
+
+        self.assertEqual(
+            [
+                (job_data["job_role"], job_data["status"])
+                for job_data in response.data["data"]["results"]
+            ],
+            [("Developer 1", "on-hold"), ("Developer 0", "shortlisted")],
+        )
+
+    def test_jobs_paginated(self):
+        for job in self.jobs:
+            self.apply(job, self.users[0])
+
+        response = self.client.get(
+            f"/user/{self.users[0].user_id}/jobs/", {"page_size": 2}
+        )
+        page = response.data["data"]
+        self.assertEqual(len(page["results"]), 2)
+
+        response = self.client.get(page["next"])
+        page = response.data["data"]
+        self.assertEqual([job["job_role"] for job in page["results"]], ["Developer 0"])
+
+    def test_jobs_without_applications(self):
+        response = self.client.get(f"/user/{self.users[0].user_id}/jobs/")
+        self.assertEqual(response.data["data"], "You haven't applied to any job")
+
+
+class UserTypeCheckTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.company = Company.objects.create(
+            name="Test Company", location="Test Location", about="Test Company"
+        )
+        auth_user = user_auth.objects.create_user(
+            email="employer@example.com",
+            name="Test Employer",
+            user_type="Employer",
+            password="password",
+        )
+        self.employer = User.objects.create(
+            user_id=auth_user.id,
+            name="Test Employer",
+            email="employer@example.com",
+            address="Test Address",
+            user_type="employer",
+        )
+        self.auth_user = auth_user
+        self.access = GenerateToken.get_tokens_for_user(auth_user)["access"]
+
+    def bulk_create(self, data):
+        job = {
+            "job_role": "Developer",
+            "company": str(self.company.company_id),
+            "location": "Test Location",
+            "post_date": "2023-10-01",
+        }
+        return self.client.post(
+            "/jobs/bulk_create/", {"jobs": [job], **data}, format="json"
+        )
+
+    def test_employer_from_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        # the profile isn't looked up, the token says it's an employer
+        self.employer.user_type = "employee"
+        self.employer.save()
+
+        response = self.bulk_create({})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Job.objects.get().employer_id, self.employer.user_id)
+
+    def test_body_employer_ignored(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+        response = self.bulk_create({"employer_id": str(uuid.uuid4())})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Job.objects.get().employer_id, self.employer.user_id)
+
+    def test_body_not_an_object(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+        for url in ("/jobs/", "/jobs/bulk_create/"):
+            response = self.client.post(url, [{"job_role": "Developer"}], format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, url)
+
+    def test_body_without_token(self):
+        response = self.bulk_create({"employer_id": str(self.employer.user_id)})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(Job.objects.exists())
+
+    def test_create_posted_by_token_user(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+        response = self.client.post(
+            "/jobs/",
+            {
+                "job_role": "Developer",
+                "company": str(self.company.company_id),
+                "location": "Test Location",
+                "post_date": "2023-10-01",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Job.objects.get().employer_id, self.employer.user_id)
+
+    def test_employer_check_cached_until_profile_saved(self):
+        user_id = self.employer.user_id
+        self.assertTrue(UserTypeCheck.is_user_employer(user_id))
+        with self.assertNumQueries(0):
+            self.assertTrue(UserTypeCheck.is_user_employer(user_id))
+
+        self.employer.user_type = "employee"
+        self.employer.save()
+        self.assertFalse(UserTypeCheck.is_user_employer(user_id))
+
+        # logged in without the token claims, the profile is checked
+        self.client.force_authenticate(user=self.auth_user)
+        response = self.bulk_create({})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BatchRetrieveTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.companies = [
+            Company.objects.create(
+                name=f"Company {n}", location="Test Location", about="Test Company"
+            )
+            for n in range(3)
+        ]
+
+    def test_batch_in_request_order_with_misses(self):
+        missing_id = str(uuid.uuid4())
+        ids = [
+            str(self.companies[2].company_id),
+            missing_id,
+            str(self.companies[0].company_id),
+        ]
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/company/batch/", {"ids": ",".join(ids)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.data["data"]
+        self.assertEqual(
+            [company and company["name"] for company in data["results"]],
+            ["Company 2", None, "Company 0"],
+        )
+        self.assertEqual(data["missing"], [missing_id])
+
+    def test_batch_jobs_number_of_applicants(self):
+        job = Job.objects.create(
+            job_role="Software Developer",
+            company=self.companies[0],
+            location="Test Location",
+            post_date=datetime.date(2023, 10, 1),
+            employer_id=uuid.uuid4(),
+            applicants_count=4,
+        )
+
+        response = self.client.get("/jobs/batch/", {"ids": str(job.job_id)})
+        self.assertEqual(response.data["data"]["results"][0]["Number of Applicants"], 4)
+
+    def test_batch_invalid_ids(self):
+        too_many_ids = ",".join(
+            str(uuid.uuid4()) for _ in range(settings.BATCH_MAX_SIZE + 1)
+        )
+        for ids in ("", "not-a-uuid", too_many_ids):
+            response = self.client.get("/user/batch/", {"ids": ids})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.company = Company.objects.create(
+            name="Test Company", location="Test Location", about="Test Company"
+        )
+        self.job = Job.objects.create(
+            job_role="Software Developer",
+            company=self.company,
+            location="Test Location",
+            post_date=datetime.date(2023, 10, 1),
+            employer_id=uuid.uuid4(),
+        )
+
+    def test_job_not_modified(self):
+        url = f"/jobs/{self.job.job_id}/"
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        # the version stamp is cached with the job
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        user = User.objects.create(
+            user_id=uuid.uuid4(),
+            name="Test User",
+            email="test@example.com",
+            address="Test Address",
+            user_type="employee",
+        )
+        Applicants.objects.create(
+            job=self.job, user=user, employer_id=self.job.employer_id
+        )
+        applicant_counters.add_application(self.job.job_id)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_depends_on_query_string(self):
+        etag = self.client.get("/jobs/")["ETag"]
+
+        response = self.client.get("/jobs/", {"page_size": 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_company_not_modified_until_changed(self):
+        etag = self.client.get("/company/")["ETag"]
+
+        # the list version is cached, nothing is queried
+        with self.assertNumQueries(0):
+            response = self.client.get("/company/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.company.about = "Updated"
+        self.company.save()
+        response = self.client.get("/company/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleted_row_changes_etag(self):
+        Company.objects.create(name="Other", location="Other", about="Other")
+        response = self.client.get("/company/")
+        etag = response["ETag"]
+        # a deleted row wouldn't move it
+        self.assertFalse(response.has_header("Last-Modified"))
+
+        self.company.delete()
+        response = self.client.get("/company/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_lists_without_table_scan(self):
+        user = User.objects.create(
+            user_id=uuid.uuid4(),
+            name="Test User",
+            email="test@example.com",
+            address="Test Address",
+            user_type="employee",
+        )
+        for url in ("/user/", "/company/jobs/", "/company/users/", "/jobs/"):
+            response = self.client.get(url)
+            self.assertFalse(response.has_header("Last-Modified"), url)
+            with self.assertNumQueries(0):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED, url)
+
+        etag = self.client.get("/user/")["ETag"]
+        user.delete()
+        response = self.client.get("/user/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_error_responses_have_no_etag(self):
+        response = self.client.get(f"/user/{uuid.uuid4()}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header("ETag"))
+
+
+class SparseFieldsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.company = Company.objects.create(
+            name="Test Company", location="Test Location", about="Test Company"
+        )
+        self.job = Job.objects.create(
+            job_role="Software Developer",
+            company=self.company,
+            description="Test description",
+            location="Test Location",
+            post_date=datetime.date(2023, 10, 1),
+            employer_id=uuid.uuid4(),
+        )
+        self.card_fields = ["job_role", "company", "location", "post_date"]
+
+    def test_list_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/jobs/", {"fields": ",".join(self.card_fields)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(response.data["data"]["results"][0], self.card_fields)
+        # the description isn't read at all
+        self.assertNotIn("description", queries[-1]["sql"])
+
+    def test_list_exclude(self):
+        response = self.client.get("/jobs/", {"exclude": "description"})
+
+        job_data = response.data["data"]["results"][0]
+        self.assertNotIn("description", job_data)
+        self.assertEqual(job_data["Number of Applicants"], 0)
+
+    def test_list_fields_paginated(self):
+        Job.objects.create(
+            job_role="Test Developer",
+            company=self.company,
+            location="Test Location",
+            post_date=datetime.date(2023, 10, 1),
+            employer_id=uuid.uuid4(),
+        )
+
+        response = self.client.get("/jobs/", {"fields": "job_role", "page_size": 1})
+        self.assertEqual(
+            response.data["data"]["results"], [{"job_role": "Test Developer"}]
+        )
+        response = self.client.get(response.data["data"]["next"])
+        self.assertEqual(
+            response.data["data"]["results"], [{"job_role": "Software Developer"}]
+        )
+
+    def test_retrieve_fields(self):
+        response = self.client.get(
+            f"/jobs/{self.job.job_id}/", {"fields": "job_role,applicants_count"}
+        )
+        self.assertEqual(
+            response.data["data"],
+            [
+                {
+                    "job_role": "Software Developer",
+                    "applicants_count": 0,
+                    "Number of Applicants": 0,
+                }
+            ],
+        )
+
+    def test_company_retrieve_and_batch_fields(self):
+        response = self.client.get(
+            f"/company/{self.company.company_id}/", {"fields": "name"}
+        )
+        self.assertEqual(response.data, {"name": "Test Company"})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/company/batch/",
+                {"ids": str(self.company.company_id), "exclude": "about"},
+            )
+        self.assertNotIn("about", response.data["data"]["results"][0])
+        self.assertNotIn('"about"', queries[-1]["sql"])
+
+    def test_user_list_fields(self):
+        User.objects.create(
+            user_id=uuid.uuid4(),
+            name="Test User",
+            email="test@example.com",
+            address="Test Address",
+            user_type="employee",
+        )
+
+        response = self.client.get("/user/", {"fields": "name,user_type"})
+        self.assertEqual(
+            response.data["data"]["results"],
+            [{"name": "Test User", "user_type": "employee"}],
+        )
+
+    def test_unknown_fields(self):
+        for url in ("/jobs/", f"/jobs/{self.job.job_id}/", "/company/", "/user/"):
+            response = self.client.get(url, {"fields": "job_role,salary"})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get("/jobs/", {"exclude": "salary"})
+        self.assertEqual(
+            response.data, {"message": {"error": "unknown fields: salary"}}
+        )
@@ -0,0 +1,134 @@
+"""
+This script maintains the denormalized applicant counters on the Job table.
+
+Every write to tbl_applicants that adds an application or changes its
+status has to call one of these functions inside the same transaction,
+so the counters never drift from the rows they count:
+1. add_application, when a user applies for a job
+2. change_application_status, when applications move to a new status
+3. remove_application, when an application is deleted (called by the
+   post_delete signal of Applicants, apps.jobs.signals, so the cascade
+   deletes of a user or a job are counted too)
+All of them also invalidate the cached responses of the jobs they touch and set
+their updated_at, since queryset.update doesn't send any signal nor
+set auto_now fields.
+"""
+
+from collections import Counter
+
+from django.db.models import Count, F
+from django.utils import timezone
+
+from apps.jobs.constants import values
+from apps.jobs.models import Applicants, Job
+from apps.jobs.utils import cache as job_cache
+
+
+def add_application(job_id, status=values.APPLICATION_STATUS_APPLIED):
+    """
+    Count one new application of the given status for job_id.
+
+    Call it before inserting the application: the UPDATE takes the
+    exclusive lock of the job row first, where the insert would take a
+    shared one (InnoDB foreign key check) that two concurrent applies
+    couldn't both upgrade without a deadlock. The counters are rolled back
+    with the transaction when the insert fails.
+    """
+
+    update_counters(job_id, status, 1)
+
+
+def remove_application(job_id, status):
+    """Uncount one deleted application of the given status for job_id"""
+
+    update_counters(job_id, status, -1)
+
+
+def update_counters(job_id, status, count):
+    fields = [values.APPLICANTS_COUNT]
+    # rows with a status that isn't counted only count in applicants_count
+    if status in values.STATUS_COUNT_FIELDS:
+        fields.append(values.STATUS_COUNT_FIELDS[status])
+
+    Job.objects.filter(job_id=job_id).update(
+        **{field: F(field) + count for field in fields},
+        updated_at=timezone.now(),
+    )
+    job_cache.invalidate_job_on_commit(job_id)
+
+
+def change_application_status(applications, new_status):
+    """
+    Update the status of the given applications and move their counts
+    from the old status column to the new one.
+
+    `applications` is an Applicants queryset, it must be called inside
+    a transaction (the rows are locked until the counters are updated).
+    Returns the number of applications that were updated.
+
+    The job rows are locked before the applications, in the same order as
+    an apply (add_application, then the insert), so the two can't
+    deadlock on each other's locks.
+    """
+
+    job_ids = set(applications.values_list(values.JOB_ID, flat=True))
+    list(
+        Job.objects.select_for_update()
+        .filter(job_id__in=job_ids)
+        .order_by(values.JOB_ID)
+        .values_list(values.JOB_ID, flat=True)
+    )
+
+    # lock the applications and count them by (job, current status)
+    status_counts = Counter(
+        applications.select_for_update().values_list(values.JOB_ID, "status")
+    )
+
+    now = timezone.now()
+    updated = applications.update(status=new_status, updated_at=now)
+
+    # one UPDATE per job, with all the status columns changed at once
+    changes_per_job = {}
+    for (job_id, old_status), count in status_counts.items():
+        if old_status == new_status:
+            continue
+        changes = changes_per_job.setdefault(job_id, Counter())
+        # rows with a status that isn't counted only add to the new one
+        if old_status in values.STATUS_COUNT_FIELDS:
+            changes[values.STATUS_COUNT_FIELDS[old_status]] -= count
+        changes[values.STATUS_COUNT_FIELDS[new_status]] += count
+
+    for job_id, changes in changes_per_job.items():
+        Job.objects.filter(job_id=job_id).update(
+            **{field: F(field) + count for field, count in changes.items() if count},
+            updated_at=now,
+        )
+        job_cache.invalidate_job_on_commit(job_id)
+
+    return updated
+
+
+def count_applications(job_ids):
+    """
+    Return the counters of the given jobs computed from tbl_applicants,
+    as {job_id: {counter_field: count}}
+    """
+
+    counts = {
+        job_id: dict.fromkeys(values.APPLICANT_COUNTER_FIELDS, 0) for job_id in job_ids
+    }
+
+    rows = (
+        Applicants.objects.filter(job_id__in=job_ids)
+        .values(values.JOB_ID, "status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        job_counts = counts[row[values.JOB_ID]]
+        job_counts[values.APPLICANTS_COUNT] += row["count"]
+        status_field = values.STATUS_COUNT_FIELDS.get(row["status"])
+        if status_field:
+            job_counts[status_field] += row["count"]
+
+    return counts
@@ -0,0 +1,170 @@
+"""
+This script exports the applications (tbl_applicants joined with the job
+and the user profile) as CSV or NDJSON, for the export endpoints and the
+export_applicants command.
+
+The rows are read in primary-key chunks of settings.STREAM_CHUNK_SIZE
+(one query per chunk, like apps.jobs.utils.streaming) and written chunk
+by chunk, optionally gzip-compressed on the fly, so an export of any size
+runs in the same memory.
+"""
+
+import csv
+import datetime
+import io
+import uuid
+import zlib
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from apps.accounts.renderers import FastJSONRenderer
+from apps.jobs.models import Applicants
+
+FORMATS = ("csv", "ndjson")
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# exported column: Applicants lookup
+EXPORT_FIELDS = {
+    "application_id": "id",
+    "job_id": "job_id",
+    "job_role": "job__job_role",
+    "user_id": "user_id",
+    "name": "user__name",
+    "email": "user__email",
+    "phone": "user__phone",
+    "address": "user__address",
+    "status": "status",
+    "resume": "resume",
+    "cover_letter": "cover_letter",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+
+FILE_FIELDS = ("resume", "cover_letter")
+
+# first characters that make a spreadsheet read a cell as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def get_applications(job_id=None, employer_id=None):
+    """applications of a job, or of all the jobs of an employer"""
+
+    applications = Applicants.objects.all()
+    if job_id is not None:
+        applications = applications.filter(job_id=job_id)
+    if employer_id is not None:
+        applications = applications.filter(employer_id=employer_id)
+    return applications
+
+
+def iterate_rows(applications, chunk_size=None):
+    """
+    Yield the exported rows (dicts) of the applications in lists of
+    chunk_size rows, in primary-key order
+    """
+
+    chunk_size = chunk_size or settings.STREAM_CHUNK_SIZE
+    applications = applications.order_by("pk").values_list(*EXPORT_FIELDS.values())
+
+    last_pk = None
+    while True:
+        chunk = applications
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+        rows = list(chunk[:chunk_size])
+        if rows:
+            yield [
+                {
+                    name: to_export_value(name, value)
+                    for name, value in zip(EXPORT_FIELDS, row)
+                }
+                for row in rows
+            ]
+        if len(rows) < chunk_size:
+            return
+        last_pk = rows[-1][0]
+
+
+def to_export_value(name, value):
+    if value is None or value == "":
+        return None
+    if name in FILE_FIELDS:
+        return default_storage.url(value)
+    if isinstance(value, datetime.datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def write_csv(chunks):
+    """Yield the CSV (with a header row) of the chunks of rows, as bytes"""
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(EXPORT_FIELDS))
+    writer.writeheader()
+    for chunk in chunks:
+        writer.writerows(
+            {name: escape_csv_value(value) for name, value in row.items()}
+            for row in chunk
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # header only, no application
+        yield buffer.getvalue().encode()
+
+
+def escape_csv_value(value):
+    """
+    Prefix the text values (applicant-provided: name, address, ...) that
+    a spreadsheet would run as a formula with a quote, so it shows them
+    as text
+    """
+
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def write_ndjson(chunks):
+    """Yield the NDJSON (one object per line) of the chunks of rows, as bytes"""
+
+    renderer = FastJSONRenderer()
+    for chunk in chunks:
+        yield b"".join(renderer.render(row) + b"\n" for row in chunk)
+
+
+def gzip_compress(data_chunks):
+    """gzip-compress the bytes of data_chunks on the fly"""
+
+    compressor = zlib.compressobj(wbits=31)  # 16 + 15: gzip header and trailer
+    for data in data_chunks:
+        compressed = compressor.compress(data)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_applications(applications, file_format, compress=False, chunk_size=None):
+    """
+    Yield the export of the applications queryset, in the given format
+    (csv or ndjson), as chunks of bytes
+    """
+
+    chunks = iterate_rows(applications, chunk_size)
+    data = write_csv(chunks) if file_format == "csv" else write_ndjson(chunks)
+    return gzip_compress(data) if compress else data
+
+
+def get_file_name(name, file_format, compress=False):
+    return f"{name}.{file_format}" + (".gz" if compress else "")
@@ -0,0 +1,233 @@
+"""
+This script implements the read-through cache of the job responses.
+
+The serialized data of /jobs/<id> and of every /jobs list page is kept in
+the cache for settings.JOBS_CACHE_TIMEOUT seconds, and dropped as soon as
+a job, a company or an application is written:
+1. a job detail entry is dropped when that job (or one of its
+   applications) changes, by changing the version of the job, which is
+   part of its detail key
+2. the list entries are all dropped at once by changing the list version,
+   which is part of every list key
+A request that read the rows before a write and fills the cache after
+the invalidation stores its value under the old version, where it's
+never read again.
+
+Writes that skip the model signals (queryset.update, bulk_create) have to
+call invalidate_job/invalidate_job_lists themselves.
+
+Cache misses are single-flight: only the request holding the key's lock
+(a cache.add) builds the value, the others wait for it. An expired entry
+is kept settings.JOBS_CACHE_STALE_GRACE more seconds, during which it's
+still served while the lock holder rebuilds it.
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+JOB_DETAIL_KEY = "jobs:detail:{}:{}"
+JOB_VERSION_KEY = "jobs:detail:version:{}"
+JOB_LIST_KEY = "jobs:list:{}:{}"
+JOB_LIST_VERSION_KEY = "jobs:list:version"
+LOCK_KEY = "{}:lock"
+
+# how often a request waiting for another one's build checks the cache
+LOCK_POLL_INTERVAL = 0.05
+
+# hit/miss counters of this process, see cache_stats()
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_or_build(key, build, timeout=None):
+    """
+    Return the cached value of key, or call build() and cache its result.
+    Exceptions raised by build() aren't cached.
+
+    The entries are stored as (value, fresh_until) and kept in the cache
+    for the grace period after fresh_until: a stale value is returned
+    as is, unless this request gets the lock to rebuild it.
+    """
+
+    entry = cache.get(key)
+    if entry is not None:
+        value, fresh_until = entry
+        if time.time() < fresh_until:
+            _count("hits")
+            return value
+
+        lock_token = _acquire_lock(key)
+        if not lock_token:
+            # someone else is already rebuilding it
+            _count("stale")
+            return value
+        return _build_and_release(key, build, timeout, lock_token)
+
+    lock_token = _acquire_lock(key)
+    if lock_token:
+        return _build_and_release(key, build, timeout, lock_token)
+
+    # wait for the lock holder's value, at most as long as the lock lasts
+    _count("waits")
+    deadline = time.time() + settings.JOBS_CACHE_LOCK_TIMEOUT
+    while time.time() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+        lock_token = _acquire_lock(key)
+        if lock_token:
+            # the lock holder failed (or the value was invalidated again)
+            return _build_and_release(key, build, timeout, lock_token)
+
+    # the lock holder is too slow, build it without the lock
+    return _build_and_release(key, build, timeout, lock_token=None)
+
+
+def job_detail_key(job_id):
+    return JOB_DETAIL_KEY.format(job_version(job_id), job_id)
+
+
+def stamp_key(key):
+    """Key of the version stamp (see utils.conditional) of a cached response"""
+
+    return f"{key}:stamp"
+
+
+def job_list_key(request):
+    """
+    Key of a job list page: the filters, cursor and page size are all in
+    the query string. The host is included as well because the next and
+    previous links are absolute urls.
+    """
+
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    )
+    digest = hashlib.sha1(repr((request.get_host(), params)).encode()).hexdigest()
+    return JOB_LIST_KEY.format(list_version(), digest)
+
+
+def invalidate_job(job_id):
+    """Drop the cached detail of job_id and every cached list page"""
+
+    bump_version(JOB_VERSION_KEY.format(job_id), _version_timeout())
+    invalidate_job_lists()
+
+
+def invalidate_job_lists():
+    """Drop every cached list page, by moving to a new list version"""
+
+    bump_version(JOB_LIST_VERSION_KEY)
+
+
+def invalidate_job_on_commit(job_id=None):
+    """
+    Invalidate now and once more when the current transaction commits,
+    so a request that read the old rows in between can't keep them cached.
+    With job_id=None only the list pages are invalidated.
+    """
+
+    def invalidate():
+        if job_id is None:
+            invalidate_job_lists()
+        else:
+            invalidate_job(job_id)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def cache_stats():
+    """
+    Return the counters of this process: hits, misses (values built),
+    stale (stale values served) and waits (misses that waited for a build)
+    """
+
+    with _stats_lock:
+        return {name: _stats[name] for name in ("hits", "misses", "stale", "waits")}
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def _acquire_lock(key):
+    """Take the build lock of key, returns its token or None if it's taken"""
+
+    token = uuid.uuid4().hex
+    if cache.add(LOCK_KEY.format(key), token, settings.JOBS_CACHE_LOCK_TIMEOUT):
+        return token
+    return None
+
+
+def _build_and_release(key, build, timeout, lock_token):
+    _count("misses")
+    try:
+        value = build()
+        timeout = settings.JOBS_CACHE_TIMEOUT if timeout is None else timeout
+        cache.set(
+            key,
+            (value, time.time() + timeout),
+            timeout + settings.JOBS_CACHE_STALE_GRACE,
+        )
+        return value
+    finally:
+        # only release our own lock, it may have expired and been retaken
+        if lock_token and cache.get(LOCK_KEY.format(key)) == lock_token:
+            cache.delete(LOCK_KEY.format(key))
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get_version(key, timeout=None):
+    """
+    Current version stored under key, a random value (not a counter) so an
+    evicted version key can't bring back the entries of an older one. A
+    missing version is created with cache.add, the first request wins.
+    """
+
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, timeout):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(key, timeout=None):
+    """Move key to a new version, see get_version"""
+
+    cache.set(key, uuid.uuid4().hex, timeout)
+
+
+def job_version(job_id):
+    """
+    Current version of a job's detail entries. It expires with them: an
+    evicted or expired version only drops the entries of the job.
+    """
+
+    return get_version(JOB_VERSION_KEY.format(job_id), _version_timeout())
+
+
+def _version_timeout():
+    return settings.JOBS_CACHE_TIMEOUT + settings.JOBS_CACHE_STALE_GRACE
+
+
+def list_version():
+    """Current version of the job lists, changed by every invalidation"""
+
+    return get_version(JOB_LIST_VERSION_KEY)
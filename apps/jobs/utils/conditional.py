@@ -0,0 +1,141 @@
+"""
+This script adds conditional GET support (ETag / Last-Modified) to the
+viewset actions.
+
+A response is identified by its url and a version stamp of the rows it
+is built from, a list of (version, last modified) tuples:
+1. version_stamp, for the responses of a few rows (a detail): the number
+   of rows and their latest updated_at, taken with one aggregate query
+   per queryset (the count catches deleted rows, which don't move the max)
+2. table_stamp, for the lists: the cached version of the tables, changed
+   on every write of one of their rows (bump_table_version), no query at
+   all and no Last-Modified, a deleted row doesn't move any timestamp
+When the client's If-None-Match (or If-Modified-Since) still matches, a
+304 is returned before the view queries and serializes anything.
+"""
+
+import functools
+import hashlib
+
+import django.core.exceptions
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from apps.jobs.utils import cache as job_cache
+
+TABLE_VERSION_KEY = "conditional:version:{}"
+
+
+def version_stamp(*querysets, timestamp_fields=("updated_at",)):
+    """
+    Return (row count, latest timestamp) of every queryset, as a list of
+    tuples. The latest timestamp is the max of all the timestamp_fields,
+    which can follow relations (e.g. "job__updated_at").
+    """
+
+    stamps = []
+    for queryset in querysets:
+        stamp = queryset.order_by().aggregate(
+            count=Count("pk"),
+            **{
+                f"last_modified_{number}": Max(field)
+                for number, field in enumerate(timestamp_fields)
+            },
+        )
+        count = stamp.pop("count")
+        last_modified = max(
+            (value for value in stamp.values() if value is not None), default=None
+        )
+        stamps.append((count, last_modified))
+    return stamps
+
+
+def table_stamp(*tables):
+    """Return the version stamp of whole tables, see table_version"""
+
+    return [(table_version(table), None) for table in tables]
+
+
+def table_version(table):
+    """Current version of a table (utils.cache.get_version)"""
+
+    return job_cache.get_version(TABLE_VERSION_KEY.format(table))
+
+
+def bump_table_version(table):
+    """
+    Change the version of a table, now and once more when the current
+    transaction commits (a request that read the old rows in between
+    can't keep the new version). Writes that skip the model signals
+    (queryset.update, bulk_create) have to call it themselves.
+    """
+
+    def bump():
+        job_cache.bump_version(TABLE_VERSION_KEY.format(table))
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def conditional_response(get_stamp, last_modified=True):
+    """
+    Decorator of a viewset GET action. get_stamp(view, request, *args, **kwargs)
+    returns the version stamp of the response (see version_stamp and
+    table_stamp), the successful responses get the matching ETag (and
+    Last-Modified, when the stamp has a timestamp) headers.
+    Use last_modified=False for the lists of a version_stamp, their rows
+    can be deleted without moving the latest timestamp.
+    """
+
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view_method(self, request, *args, **kwargs)
+
+            try:
+                stamps = get_stamp(self, request, *args, **kwargs)
+            except django.core.exceptions.ValidationError:
+                # invalid ids/filters, the view returns the error
+                return view_method(self, request, *args, **kwargs)
+
+            etag = make_etag(request, stamps)
+            timestamp = None
+            if last_modified:
+                latest = max(
+                    (stamp[1] for stamp in stamps if stamp[1] is not None),
+                    default=None,
+                )
+                timestamp = int(latest.timestamp()) if latest else None
+
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp
+            )
+            if response is None:
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def make_etag(request, stamps):
+    """Strong ETag of the response to `request` for the given stamps"""
+
+    source = repr(
+        (
+            request.get_full_path(),
+            request.META.get("HTTP_ACCEPT", ""),
+            [(version, str(last_modified)) for version, last_modified in stamps],
+        )
+    )
+    return '"{}"'.format(hashlib.sha1(source.encode()).hexdigest())
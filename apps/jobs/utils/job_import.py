@@ -0,0 +1,115 @@
+"""
+This script imports jobs in bulk, it's used by both the
+/jobs/bulk_create endpoint and the `manage.py import_jobs` command.
+
+The rows are consumed lazily (so a big file is never fully loaded)
+and handled in chunks:
+1. every row of the chunk is validated with JobImportSerializer
+2. the companies and employers of the chunk are checked with one query each
+3. the valid rows are saved with a single bulk_create
+Invalid rows are skipped and reported with their row number.
+"""
+
+import uuid
+
+from apps.jobs.constants import values
+from apps.jobs.models import Company, Job, User
+from apps.jobs.serializers import JobImportSerializer
+from apps.jobs.utils import cache as job_cache
+
+IMPORT_CHUNK_SIZE = 500
+
+
+def import_jobs(rows, employer_id=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Create a job for each valid row (dict) of `rows`.
+
+    If employer_id is given, it's used for every row (and has to be checked
+    by the caller), otherwise each row brings its own employer_id.
+    returns {"created": count, "errors": [{"row": number, "errors": {...}}]}
+    """
+
+    result = {"created": 0, "errors": []}
+    # employer_id -> is an employer, shared by all the chunks
+    employers = {uuid.UUID(str(employer_id)): True} if employer_id else {}
+
+    chunk = []
+    for row_number, row in enumerate(rows, start=1):
+        chunk.append((row_number, row))
+        if len(chunk) >= chunk_size:
+            import_chunk(chunk, employer_id, employers, result)
+            chunk = []
+    if chunk:
+        import_chunk(chunk, employer_id, employers, result)
+
+    return result
+
+
+def import_chunk(chunk, employer_id, employers, result):
+    """validate and save one chunk of (row number, row) pairs"""
+
+    valid_rows = []
+    for row_number, row in chunk:
+        if not isinstance(row, dict):
+            result["errors"].append(
+                {"row": row_number, "errors": {"non_field_errors": ["Invalid row"]}}
+            )
+            continue
+
+        if employer_id:
+            row = {**row, values.EMPLOYER_ID: employer_id}
+        elif not row.get(values.EMPLOYER_ID):
+            result["errors"].append(
+                {
+                    "row": row_number,
+                    "errors": {values.EMPLOYER_ID: ["This field is required."]},
+                }
+            )
+            continue
+
+        serializer = JobImportSerializer(data=row)
+        if serializer.is_valid():
+            valid_rows.append((row_number, serializer.validated_data))
+        else:
+            result["errors"].append({"row": row_number, "errors": serializer.errors})
+
+    # check the companies and the (not yet seen) employers of this chunk
+    company_ids = set(
+        Company.objects.filter(
+            company_id__in={data[values.COMPANY_ID] for _, data in valid_rows}
+        ).values_list(values.COMPANY_ID, flat=True)
+    )
+    unknown_employer_ids = {
+        data[values.EMPLOYER_ID] for _, data in valid_rows
+    } - employers.keys()
+    if unknown_employer_ids:
+        employer_ids = set(
+            User.objects.filter(
+                user_id__in=unknown_employer_ids, user_type__iexact="employer"
+            ).values_list(values.USER_ID, flat=True)
+        )
+        for unknown_employer_id in unknown_employer_ids:
+            employers[unknown_employer_id] = unknown_employer_id in employer_ids
+
+    jobs = []
+    for row_number, data in valid_rows:
+        errors = {}
+        if data[values.COMPANY_ID] not in company_ids:
+            errors["company"] = [
+                f'Invalid pk "{data[values.COMPANY_ID]}" - object does not exist.'
+            ]
+        if not employers.get(data[values.EMPLOYER_ID]):
+            errors[values.EMPLOYER_ID] = [
+                f"{data[values.EMPLOYER_ID]} isn't an employer id"
+            ]
+
+        if errors:
+            result["errors"].append({"row": row_number, "errors": errors})
+        else:
+            jobs.append(Job(**data))
+
+    Job.objects.bulk_create(jobs, batch_size=len(chunk))
+    result["created"] += len(jobs)
+    if jobs:
+        # bulk_create doesn't send post_save
+        job_cache.invalidate_job_on_commit()
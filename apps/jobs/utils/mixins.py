@@ -0,0 +1,207 @@
+"""
+This file contains the mixins shared by the jobs API viewsets.
+"""
+
+from django.conf import settings
+from rest_framework import exceptions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from apps.jobs.constants import response
+from apps.jobs.utils.validators import validationClass
+
+
+class BatchRetrieveMixin:
+    """
+    Adds a batch retrieve action to a viewset:
+        API: /api/v1/<resource>/batch?ids=<id>,<id>,...
+    All the objects are fetched with a single `pk__in` query. The results
+    follow the order of the requested ids, with null in place of the ids
+    that don't exist (also listed under "missing").
+    """
+
+    @action(detail=False, methods=["get"])
+    def batch(self, request):
+        ids = [
+            object_id
+            for ids in request.query_params.getlist("ids")
+            for object_id in ids.split(",")
+            if object_id
+        ]
+
+        if not ids:
+            return response.create_response(
+                "ids not present or invalid", status.HTTP_400_BAD_REQUEST
+            )
+        if len(ids) > settings.BATCH_MAX_SIZE:
+            return response.create_response(
+                f"at most {settings.BATCH_MAX_SIZE} ids are allowed",
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        invalid_ids = [
+            object_id
+            for object_id in ids
+            if not validationClass.is_valid_uuid(object_id)
+        ]
+        if invalid_ids:
+            return response.create_response(
+                {"error": "ids aren't valid UUIDs", "ids": invalid_ids},
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        instances = list(self.get_queryset().filter(pk__in=ids))
+        data_per_id = {
+            str(instance.pk): data
+            for instance, data in zip(instances, self.get_batch_data(instances))
+        }
+
+        return response.create_response(
+            {
+                "results": [data_per_id.get(object_id) for object_id in ids],
+                "missing": [
+                    object_id for object_id in ids if object_id not in data_per_id
+                ],
+            },
+            status.HTTP_200_OK,
+        )
+
+    def get_batch_data(self, instances):
+        """return the serialized data of the instances, in the same order"""
+
+        return self.get_serializer(instances, many=True).data
+
+
+class InvalidFields(exceptions.ValidationError):
+    """unknown names in ?fields=/?exclude=, same body as response.create_response"""
+
+    def __init__(self, names):
+        super().__init__({"message": {"error": f"unknown fields: {', '.join(names)}"}})
+
+
+class InvalidBody(exceptions.ValidationError):
+    """request body that isn't an object, same body as response.create_response"""
+
+    def __init__(self):
+        super().__init__({"message": {"error": "the request body must be an object"}})
+
+
+class ObjectBodyMixin:
+    """
+    Rejects (400) the POST/PUT/PATCH requests whose body isn't an object
+    (e.g. a JSON array), which the actions read with request.data.get()
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in ("POST", "PUT", "PATCH") and not isinstance(
+            request.data, dict
+        ):
+            raise InvalidBody()
+
+
+class SparseFieldsMixin:
+    """
+    Adds ?fields=a,b (only those fields) and ?exclude=a,b (all but those)
+    to the sparse_fields_actions of a viewset. The names are checked against
+    the serializer's fields (400 if unknown) and passed to the serializers
+    in their context under "fields", and only the columns of those fields
+    are read from the database.
+    """
+
+    sparse_fields_actions = ("list", "retrieve", "batch")
+    requested_fields = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.sparse_fields_actions:
+            self.requested_fields = self.get_requested_fields(request)
+
+    def get_requested_fields(self, request):
+        """return the names of the requested fields, None for all of them"""
+
+        fields, exclude = (
+            [
+                name
+                for names in request.query_params.getlist(param)
+                for name in names.split(",")
+                if name
+            ]
+            for param in ("fields", "exclude")
+        )
+        if not fields and not exclude:
+            return None
+
+        available = list(self.get_serializer_fields())
+        unknown = [name for name in fields + exclude if name not in available]
+        if unknown:
+            raise InvalidFields(unknown)
+        return [
+            name
+            for name in available
+            if (not fields or name in fields) and name not in exclude
+        ]
+
+    def get_serializer_fields(self):
+        """the readable fields of the serializer, by name"""
+
+        return {
+            name: field
+            for name, field in self.serializer_class().fields.items()
+            if not field.write_only
+        }
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.requested_fields
+        return context
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.requested_fields is not None and self.action != "list":
+            # the lists use .values() (ValuesListMixin) instead
+            serializer_fields = self.get_serializer_fields()
+            queryset = queryset.only(
+                *{serializer_fields[name].source for name in self.requested_fields}
+            )
+        return queryset
+
+    def get_values(self, list_serializer_class, queryset, extra=()):
+        """
+        .values() rows of queryset for list_serializer_class, with the
+        columns of the requested fields, the ones of the pagination
+        ordering and the `extra` columns
+        """
+
+        ordering = getattr(self.paginator, "ordering", None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return list_serializer_class.values(
+            queryset,
+            fields=self.requested_fields,
+            extra=[field.lstrip("-") for field in ordering] + list(extra),
+        )
+
+
+class ValuesListMixin(SparseFieldsMixin):
+    """
+    Serializes the list action with list_serializer_class (a read-only
+    serializers.ValuesListSerializer), from the `.values()` rows of the
+    page instead of model instances.
+    """
+
+    list_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        rows = self.get_values(
+            self.list_serializer_class, self.filter_queryset(self.get_queryset())
+        )
+        context = self.get_serializer_context()
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            serializer = self.list_serializer_class(page, context=context)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.list_serializer_class(rows, context=context)
+        return Response(serializer.data)
@@ -0,0 +1,43 @@
+"""
+This file contains the pagination class used by the jobs API listings.
+
+Cursor (keyset) pagination is used instead of page numbers/offsets, so
+fetching a deep page costs the same as fetching the first one: every page
+is a `WHERE created_at < <cursor>` range scan over the (created_at, pk)
+index, rather than an OFFSET that makes the database walk all the skipped
+rows first.
+"""
+
+from django.conf import settings
+from rest_framework import pagination, status
+
+from apps.jobs.constants import response
+
+
+class CreatedAtCursorPagination(pagination.CursorPagination):
+    """
+    Opaque cursor pagination ordered on (created_at, pk), newest first.
+
+    The page size defaults to REST_FRAMEWORK["PAGE_SIZE"] and can be changed
+    with ?page_size=, but never above settings.MAX_PAGE_SIZE.
+    """
+
+    ordering = ("-created_at", "-pk")
+    page_size_query_param = "page_size"
+    max_page_size = settings.MAX_PAGE_SIZE
+
+    def get_paginated_data(self, data):
+        """The page with its links, as returned in the response data"""
+
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_paginated_response(self, data):
+        """Wrap the page in the same envelope as `response.create_response`"""
+
+        return response.create_response(
+            self.get_paginated_data(data), status.HTTP_200_OK
+        )
@@ -0,0 +1,78 @@
+"""
+This script streams whole (unpaginated) lists as JSON, for ?stream=1.
+
+The rows are read in keyset chunks, newest first like the paginated lists
+(created_at, pk), each chunk with its own query: queryset.iterator() isn't
+enough because mysqlclient still loads the whole result in memory. Every
+chunk is serialized and rendered on its own, so the worker's memory use
+doesn't depend on the number of rows. The body keeps the envelope of
+response.create_response: {"data": [...]}.
+"""
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+
+from apps.accounts.renderers import FastJSONRenderer
+
+
+def is_stream_requested(request):
+    return request.query_params.get("stream", "").lower() in ("1", "true")
+
+
+def iterate_in_chunks(queryset, chunk_size=None):
+    """
+    Yield the rows of queryset in lists of chunk_size rows, newest first.
+    For a .values() queryset, the rows need the created_at and primary key
+    columns.
+    """
+
+    chunk_size = chunk_size or settings.STREAM_CHUNK_SIZE
+    queryset = queryset.order_by("-created_at", "-pk")
+    pk_name = queryset.model._meta.pk.attname
+
+    last_row = None
+    while True:
+        chunk = queryset
+        if last_row is not None:
+            created_at, pk = get_position(last_row, pk_name)
+            chunk = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+            )
+        rows = list(chunk[:chunk_size])
+        if rows:
+            yield rows
+        if len(rows) < chunk_size:
+            return
+        last_row = rows[-1]
+
+
+def get_position(row, pk_name):
+    if isinstance(row, dict):
+        return row["created_at"], row[pk_name]
+    return row.created_at, row.pk
+
+
+def stream_json_list(chunks, serialize_chunk):
+    """
+    Yield the JSON body {"data": [...]} of the items serialized from the
+    chunks, serialize_chunk(chunk) returns the list of items of a chunk
+    """
+
+    renderer = FastJSONRenderer()
+    yield b'{"data":['
+    separator = b""
+    for chunk in chunks:
+        data = serialize_chunk(chunk)
+        if not data:
+            continue
+        # the items of the rendered list, without its brackets
+        yield separator + renderer.render(data)[1:-1]
+        separator = b","
+    yield b"]}"
+
+
+def streaming_json_response(chunks, serialize_chunk):
+    return StreamingHttpResponse(
+        stream_json_list(chunks, serialize_chunk), content_type="application/json"
+    )
@@ -6,16 +6,33 @@ This script perform checks on user_id, to find out
     then disallow.
 """
 
+from django.conf import settings
 from rest_framework import permissions
 
+from apps.accounts.utils import TTLCache
 from apps.jobs.models import User
 from apps.jobs.constants import values
 from apps.jobs.utils.validators import validationClass
 
+# is_user_employer results by user_id, dropped when a profile is saved
+# (apps.jobs.signals) or its user_type updated (UserViewSets.update)
+employer_cache = TTLCache(settings.EMPLOYER_CACHE_TTL, settings.EMPLOYER_CACHE_SIZE)
+
 
 class UserTypeCheck(permissions.BasePermission):
     EMPLOYER_ALLOWED_ACTIONS = {
-        "job": ["apply", "create", "user", "list", "retrieve", "update_application"]
+        "job": [
+            "apply",
+            "create",
+            "bulk_create",
+            "user",
+            "list",
+            "retrieve",
+            "update_application",
+            "update_applications",
+            "export_job_applicants",
+            "export_applicants",
+        ]
     }
 
     EMPLOYEE_ALLOWED_ACTIONS = {"job": ["list", "retrieve"]}
@@ -23,26 +40,70 @@ class UserTypeCheck(permissions.BasePermission):
     def has_permission(self, request, view):
         """Return bool values based on user_type"""
 
-        # Add the user_id to the JWT Later
-        employer_id = request.data.get(values.EMPLOYER_ID)
+        employer_id = self.get_employer_id(request)
 
-        if not employer_id or not validationClass.is_valid_uuid(
-            request.data[values.EMPLOYER_ID]
-        ):
+        if not employer_id or not validationClass.is_valid_uuid(employer_id):
             return False
 
         if (
-            not self.is_user_employer(employer_id)
+            not self.is_request_employer(request, employer_id)
             or view.action not in self.EMPLOYER_ALLOWED_ACTIONS[view.basename]
         ):
             return False
 
         return super().has_permission(request, view)
 
+    @staticmethod
+    def get_token_claims(request):
+        """
+        (user_id, user_type) claims of the request's access token, or
+        (None, None) without a token or with one issued before user_type
+        was added to the tokens
+        """
+
+        token = request.auth
+        if token is None or not hasattr(token, "get"):
+            return None, None
+        user_id, user_type = token.get(values.USER_ID), token.get("user_type")
+        if user_id is None or user_type is None:
+            return None, None
+        return str(user_id), user_type
+
+    @staticmethod
+    def get_employer_id(request):
+        """
+        The employer id of the request, always the authenticated user (the
+        user of the access token), None without one. The employer_id of
+        the body or query string isn't read.
+        """
+
+        user = request.user
+        if not user or not user.is_authenticated:
+            return None
+        return str(user.id)
+
+    @classmethod
+    def is_request_employer(cls, request, employer_id):
+        """
+        Check if employer_id belongs to an employer, from the user_type
+        claim when it's the user of the access token (no query)
+        """
+
+        token_user_id, user_type = cls.get_token_claims(request)
+        if token_user_id is not None and token_user_id == str(employer_id):
+            return user_type.lower() == "employer"
+        return cls.is_user_employer(employer_id)
+
     @staticmethod
     def is_user_employer(user_id):
         """Check if the user_id belongs to employer"""
 
-        # check if the user_id belongs to any user
-        user_data = User.objects.filter(user_id=user_id, user_type__iexact="employer")
-        return True if user_data.exists() else False
+        key = str(user_id)
+        is_employer = employer_cache.get(key)
+        if is_employer is None:
+            # check if the user_id belongs to any user
+            is_employer = User.objects.filter(
+                user_id=user_id, user_type__iexact="employer"
+            ).exists()
+            employer_cache.set(key, is_employer)
+        return is_employer
@@ -20,6 +20,14 @@ class validationClass:
         else:
             return str(uuid_value) == str(value)
 
+    @staticmethod
+    def is_positive_int(value):
+        # Expects a positive integer (or its string form), returns bool value
+        try:
+            return int(value) > 0
+        except (TypeError, ValueError):
+            return False
+
     @staticmethod
     def validate_id(uuid, idtype: str, model_class):
         """perform checks on uuid, and if it
@@ -28,7 +36,7 @@ class validationClass:
         if not validationClass.is_valid_uuid(uuid):
             return {"error": f"{idtype} isn't a valid UUID"}
 
-        if model_class.objects.filter(pk=uuid).count() < 1:
+        if not model_class.objects.filter(pk=uuid).exists():
             return {"error": f"This {idtype} doesn't exist"}
 
     def image_validation(self, image_file):
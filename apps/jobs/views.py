@@ -1,32 +1,60 @@
 import uuid
+from collections import defaultdict
 from re import search
 
 import django.core.exceptions
 import jwt
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import Exists, F, Q, Subquery, Window
 from django.db.models.expressions import RawSQL
+from django.db.models.functions import RowNumber
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from apps.accounts.models import User as user_auth
+from apps.accounts.utils import user_cache
 from apps.jobs.models import Applicants, Company, Job, User
 from apps.jobs.constants import values, response
 from apps.jobs.serializers import (
     ApplicantsSerializer,
+    CompanyListSerializer,
     CompanySerializer,
+    JobListSerializer,
     JobSerializer,
+    UserListSerializer,
     UserSerializer,
 )
+from apps.jobs.utils import applicant_counters, applicant_export
+from apps.jobs.utils import cache as job_cache
+from apps.jobs.utils import job_import, streaming
+from apps.jobs.utils.conditional import (
+    bump_table_version,
+    conditional_response,
+    table_stamp,
+    version_stamp,
+)
+from apps.jobs.utils.mixins import (
+    BatchRetrieveMixin,
+    ObjectBodyMixin,
+    SparseFieldsMixin,
+    ValuesListMixin,
+)
 from apps.jobs.utils.validators import validationClass
 
-from .utils.user_permissions import UserTypeCheck
+from .utils.user_permissions import UserTypeCheck, employer_cache
 
 # Create your views here.
 # the ModelViewSet provides basic crud methods like create, update etc.
 
 
-class JobViewSets(viewsets.ModelViewSet):
+class JobViewSets(
+    ObjectBodyMixin, BatchRetrieveMixin, SparseFieldsMixin, viewsets.ModelViewSet
+):
     """
     Job object viewsets
     API: /api/v1/jobs
@@ -35,6 +63,9 @@ class JobViewSets(viewsets.ModelViewSet):
         1. List jobs/specific job
         3. check number of applicants
         4. create or update job
+        5. batch retrieve jobs (/jobs/batch?ids=)
+        6. export the applicants of a job or of an employer (CSV/NDJSON)
+    list, retrieve and batch take ?fields=/?exclude= (SparseFieldsMixin)
     """
 
     queryset = Job.objects.all()
@@ -47,6 +78,34 @@ class JobViewSets(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["company", "location"]
 
+    def get_list_filters(self, request):
+        """return the filters (filterset_fields) given in the query_params"""
+
+        filters_dict = {}
+        if request.query_params:
+            filters = request.query_params
+            for filter_name, filter_value in filters.items():
+                if filter_name in self.filterset_fields and filter_value:
+                    filters_dict[filter_name] = filter_value
+        return filters_dict
+
+    def get_list_stamp(self, request):
+        """
+        version stamp of the job lists, their cache version (changed by
+        every write of a job, company or application)
+        """
+
+        return [(job_cache.list_version(), None)]
+
+    def get_detail_stamp(self, request, pk=None):
+        """version stamp of a job detail, cached along with the detail"""
+
+        return job_cache.get_or_build(
+            job_cache.stamp_key(job_cache.job_detail_key(pk)),
+            lambda: version_stamp(Job.objects.filter(job_id=pk)),
+        )
+
+    @conditional_response(get_list_stamp)
     def list(self, request):
         """
         Overrided the default list action provided by
@@ -55,47 +114,116 @@ class JobViewSets(viewsets.ModelViewSet):
         """
 
         # check for the query_params (in case of filter)
-        filters_dict = {}
-        if request.query_params:
-            filters = request.query_params
-            for filter_name, filter_value in filters.items():
-                if filter_name in self.filterset_fields and filter_value:
-                    filters_dict[filter_name] = filter_value
+        filters_dict = self.get_list_filters(request)
 
         # Even if the filters_dict is empty, it returns
         # overall data present in the Job, exception if wrong
         # uuid value is given.
         try:
-            jobs_data = self.queryset.filter(**filters_dict)
+            if streaming.is_stream_requested(request):
+                return self.get_list_stream(filters_dict)
+
+            page_data = job_cache.get_or_build(
+                job_cache.job_list_key(request),
+                lambda: self.get_list_page_data(request, filters_dict),
+            )
         except django.core.exceptions.ValidationError as err:
             return response.create_response(
                 err.messages, status.HTTP_404_NOT_FOUND)
         else:
-            serialized_job_data = self.serializer_class(
-                jobs_data, many=True, context={"request": request}
-            )
+            return response.create_response(page_data, status.HTTP_200_OK)
+
+    def get_list_stream(self, filters_dict):
+        """
+        all the filtered jobs (?stream=1), streamed in chunks instead of
+        paginated, and not cached
+        """
 
-            # get number of applicants
-            if serialized_job_data:
-                serialized_job_data = self.get_number_of_applicants(serialized_job_data)
+        jobs_data = self.get_values(
+            JobListSerializer,
+            self.queryset.filter(**filters_dict),
+            extra=("created_at", "job_id"),
+        )
+        context = self.get_serializer_context()
+        return streaming.streaming_json_response(
+            streaming.iterate_in_chunks(jobs_data),
+            lambda rows: self.get_number_of_applicants(
+                JobListSerializer(rows, context=context)
+            ).data,
+        )
+
+    def get_list_page_data(self, request, filters_dict):
+        """serialized page of the filtered jobs, with its next/previous links"""
+
+        jobs_data = self.get_values(
+            JobListSerializer,
+            self.queryset.filter(**filters_dict),
+            extra=("created_at", "job_id"),
+        )
+        # only the requested page is fetched (keyset pagination)
+        page = self.paginate_queryset(jobs_data)
+        serialized_job_data = JobListSerializer(
+            page, context=self.get_serializer_context()
+        )
+
+        # get number of applicants
+        if serialized_job_data:
+            serialized_job_data = self.get_number_of_applicants(serialized_job_data)
+
+        return self.paginator.get_paginated_data(serialized_job_data.data)
 
-            return response.create_response(serialized_job_data.data, status.HTTP_200_OK)
+    def get_permissions(self):
+        """only the employers create jobs, the other actions set their own"""
+
+        if self.action == "create":
+            return [UserTypeCheck()]
+        return super().get_permissions()
 
     def create(self, request, *args, **kwargs):
-        """Overriding the create method to include permissions"""
+        """
+        Overriding the create method, the job is always posted by the
+        authenticated employer (checked by UserTypeCheck)
+        """
 
-        employer_id = request.data.get(values.EMPLOYER_ID)
+        data = request.data.copy()
+        data[values.EMPLOYER_ID] = UserTypeCheck.get_employer_id(request)
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        headers = self.get_success_headers(serializer.data)
+        return Response(
+            serializer.data, status=status.HTTP_201_CREATED, headers=headers
+        )
 
-        if not employer_id or not UserTypeCheck.is_user_employer(
-            request.data[values.EMPLOYER_ID]
-        ):
+    @action(detail=False, methods=["post"], permission_classes=[UserTypeCheck])
+    def bulk_create(self, request):
+        """
+        API: /api/v1/jobs/bulk_create
+        Create many jobs of the authenticated employer at once, the request
+        body is
+            {"jobs": [{...job...}, {...job...}]}
+        The employer is checked once for all the jobs, the valid jobs are
+        created and the invalid ones are reported by their position.
+        """
+
+        employer_id = UserTypeCheck.get_employer_id(request)
+        jobs = request.data.get("jobs")
+        if not jobs or not isinstance(jobs, list):
             return response.create_response(
-                response.PERMISSION_DENIED + " You don't have permissions to create jobs",
-                status.HTTP_401_UNAUTHORIZED
+                "jobs not present or invalid", status.HTTP_400_BAD_REQUEST
+            )
+        if len(jobs) > settings.BATCH_MAX_SIZE:
+            return response.create_response(
+                f"at most {settings.BATCH_MAX_SIZE} jobs are allowed",
+                status.HTTP_400_BAD_REQUEST,
             )
 
-        return super().create(request, *args, **kwargs)
+        result = job_import.import_jobs(jobs, employer_id=employer_id)
+        if not result["created"]:
+            return response.create_response(result, status.HTTP_400_BAD_REQUEST)
+        return response.create_response(result, status.HTTP_201_CREATED)
 
+    @conditional_response(get_detail_stamp)
     def retrieve(self, request, pk=None):
         """
         retrieve the data of given job id
@@ -106,25 +234,47 @@ class JobViewSets(viewsets.ModelViewSet):
                 f"value {pk} isn't a correct id", status.HTTP_404_NOT_FOUND,
             )
 
-        # filter based on pk
-        job_data = Job.objects.filter(job_id=pk)
-        serialized_job_data = self.serializer_class(job_data, many=True)
-        serialized_job_data = self.get_number_of_applicants(serialized_job_data)
-        return response.create_response(serialized_job_data.data, status.HTTP_200_OK)
+        # filter based on pk, the serialized data is cached until the job
+        # (or one of its applications) changes
+        def get_job_data():
+            job_data = Job.objects.filter(job_id=pk)
+            serialized_job_data = self.serializer_class(job_data, many=True)
+            return self.get_number_of_applicants(serialized_job_data).data
+
+        job_data = job_cache.get_or_build(job_cache.job_detail_key(pk), get_job_data)
+
+        # the whole job is cached, ?fields=/?exclude= only trim it here
+        if self.requested_fields is not None:
+            fields = list(self.requested_fields)
+            if values.APPLICANTS_COUNT in fields:
+                fields.append("Number of Applicants")
+            job_data = [{name: data[name] for name in fields} for data in job_data]
+        return response.create_response(job_data, status.HTTP_200_OK)
+
+    def get_batch_data(self, instances):
+        """batch retrieve data, with the number of applicants like retrieve"""
+
+        serialized_job_data = self.get_serializer(instances, many=True)
+        return self.get_number_of_applicants(serialized_job_data).data
 
     def get_number_of_applicants(self, serialized_data):
         """
         return serialized_data with a new field added to it,
         that contains count of number of applicants.
+
+        The count is read from the job's own applicants_count column,
+        so no query is made here (and it's only added when that column
+        is part of the data, see ?fields=).
         """
 
         if not serialized_data:
             raise Exception("Serialized data not provided")
 
         for jobdata in serialized_data.data:
-            job_id = jobdata.get(values.JOB_ID)
-            number_of_applicants = Applicants.objects.filter(job_id=job_id).count()
-            jobdata.update({"Number of Applicants": number_of_applicants})
+            if values.APPLICANTS_COUNT in jobdata:
+                jobdata.update(
+                    {"Number of Applicants": jobdata[values.APPLICANTS_COUNT]}
+                )
 
         return serialized_data
 
@@ -155,64 +305,137 @@ class JobViewSets(viewsets.ModelViewSet):
         )
         return response.create_response(serialized_data.data, status.HTTP_200_OK)
 
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="applicants/export",
+        permission_classes=[UserTypeCheck],
+    )
+    def export_job_applicants(self, request, pk=None):
+        """
+        API Path: /api/v1/jobs/{pk}/applicants/export
+        stream every application of the job as CSV (default) or NDJSON
+        (?output=ndjson), gzip-compressed with ?gzip=1
+        """
+
+        error_response = self.check_job_employer(
+            pk, UserTypeCheck.get_employer_id(request)
+        )
+        if error_response:
+            return error_response
+
+        return self.export_response(
+            request, applicant_export.get_applications(job_id=pk), f"applicants-{pk}"
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="applicants/export",
+        permission_classes=[UserTypeCheck],
+    )
+    def export_applicants(self, request):
+        """
+        API Path: /api/v1/jobs/applicants/export
+        stream every application for the jobs of the employer, same
+        options as /jobs/{pk}/applicants/export
+        """
+
+        employer_id = UserTypeCheck.get_employer_id(request)
+        return self.export_response(
+            request,
+            applicant_export.get_applications(employer_id=employer_id),
+            f"applicants-{employer_id}",
+        )
+
+    @staticmethod
+    def export_response(request, applications, name):
+        """streamed export of the applications, as a file attachment"""
+
+        # not ?format=, which selects the DRF renderer
+        file_format = request.query_params.get("output", "csv").lower()
+        if file_format not in applicant_export.FORMATS:
+            return response.create_response(
+                f"value {file_format} isn't a correct output, use csv or ndjson",
+                status.HTTP_400_BAD_REQUEST,
+            )
+        compress = request.query_params.get("gzip", "").lower() in ("1", "true")
+
+        export_response = StreamingHttpResponse(
+            applicant_export.export_applications(applications, file_format, compress),
+            content_type=(
+                "application/gzip"
+                if compress
+                else applicant_export.CONTENT_TYPES[file_format]
+            ),
+        )
+        file_name = applicant_export.get_file_name(name, file_format, compress)
+        export_response["Content-Disposition"] = f'attachment; filename="{file_name}"'
+        return export_response
+
     @action(detail=True, methods=["post"])
     def apply(self, request, pk=None):
         """Apply job functionality implementation"""
 
         job_id = pk
-        user_id = request.data[values.USER_ID]
+        user_id = request.data.get(values.USER_ID)
 
-        # validate, if both of them exists or not
-        response_message = validationClass.validate_id(
-            job_id, "job-id", Job
-        ) or validationClass.validate_id(user_id, "user-id", User)
-        if response_message:
-            return response.create_response(
-                response_message, status.HTTP_400_BAD_REQUEST
-            )
-
-        # Check whether the user has applied for the job before
-        apply_job_status = Applicants.objects.filter(
-            job_id=job_id, user_id=user_id
-        ).exists()
-        if apply_job_status:
-            return response.create_response(
-                "You have already applied for this Job",
-                status.HTTP_200_OK
-            )
+        # validate the ids before going to the database
+        for id_value, idtype in ((job_id, "job-id"), (user_id, "user-id")):
+            if not validationClass.is_valid_uuid(id_value):
+                return response.create_response(
+                    {"error": f"{idtype} isn't a valid UUID"},
+                    status.HTTP_400_BAD_REQUEST,
+                )
 
-        # Get the data from the user's database (only resume N cover_letter)
-        # if any single one of them isn't found, return a message to update that.
+        # A single query gets the employer-id of the job along with the
+        # user's resume N cover_letter (and whether the user exists at all)
+        user_profile = User.objects.filter(user_id=user_id)
         applyjob_data = (
-            User.objects.filter(user_id=user_id)
-            .values("resume", "cover_letter")
+            Job.objects.filter(job_id=job_id)
+            .annotate(
+                user_exists=Exists(user_profile),
+                resume=Subquery(user_profile.values("resume")),
+                cover_letter=Subquery(user_profile.values("cover_letter")),
+            )
+            .values(values.EMPLOYER_ID, "user_exists", "resume", "cover_letter")
             .first()
         )
+        if not applyjob_data or not applyjob_data.pop("user_exists"):
+            idtype = "user-id" if applyjob_data else "job-id"
+            return response.create_response(
+                {"error": f"This {idtype} doesn't exist"},
+                status.HTTP_400_BAD_REQUEST,
+            )
 
-        for key, value in applyjob_data.items():
-            if not value:
+        # if any single one of them isn't found, return a message to update that.
+        for key in ("resume", "cover_letter"):
+            if not applyjob_data[key]:
                 return response.create_response(
                     f"You don't have {key} updated",
                     status.HTTP_400_BAD_REQUEST
                 )
 
-        # Get the employer-id from the database
-        # employer-id always exists in the db, without this job can't be created
-        employer_id = (
-            Job.objects.filter(job_id=job_id)
-            .values(values.EMPLOYER_ID)
-            .first()[values.EMPLOYER_ID]
-        )
-
         # Prepare the overall dictionary to save into the database
-        # Add job-id, user-id, employer-id to the applyjob_data
+        # Add job-id, user-id to the applyjob_data (employer-id is already there)
         applyjob_data[values.JOB_ID] = job_id
         applyjob_data[values.USER_ID] = user_id
-        applyjob_data[values.EMPLOYER_ID] = employer_id
 
-        # Add this application into the database
-        applyjob = Applicants(**applyjob_data)
-        applyjob.save()
+        # Add this application into the database, along with the job's
+        # applicant counters in the same transaction (the counters first,
+        # see add_application).
+        # There's no "applied before?" check, the unique (job, user)
+        # constraint rejects the second application instead, so two
+        # concurrent requests can't both get in.
+        try:
+            with transaction.atomic():
+                applicant_counters.add_application(job_id)
+                Applicants.objects.create(**applyjob_data)
+        except IntegrityError:
+            return response.create_response(
+                "You have already applied for this Job",
+                status.HTTP_200_OK
+            )
 
         return response.create_response(
             "You have successfully applied for this job",
@@ -221,51 +444,181 @@ class JobViewSets(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["post"], permission_classes=[UserTypeCheck])
     def update_application(self, request, pk=None):
-        """This method updates the status of user application"""
+        """
+        This method updates the status of user application
+
+        Only the application of the given user_id for this job is updated,
+        several applications are updated with update_applications.
+        """
 
         # check for status_id
-        if "status" not in request.data or not request.data["status"]:
+        if (
+            "status" not in request.data
+            or request.data["status"] not in values.STATUS_COUNT_FIELDS
+        ):
             return response.create_response(
                 "status-id not present or invalid",
                 status.HTTP_400_BAD_REQUEST,
             )
 
-        # check if job_id is valid & present in db or not
-        response_message = validationClass.validate_id(pk, "job-id", Job)
-        if response_message:
-            return response.create_response(response_message, status.HTTP_400_BAD_REQUEST)
-
-        # check if the given employer_id has posted the job (given by job-id)
-        employer_id = request.data[values.EMPLOYER_ID]
-        job_employer_id = (
-            Job.objects.filter(job_id=pk)
-            .values(values.EMPLOYER_ID)
-            .first()[values.EMPLOYER_ID]
-        )
-        if str(job_employer_id) != employer_id:
+        # a missing user_id mustn't become an update of every application
+        user_id = request.data.get(values.USER_ID)
+        if not user_id or not validationClass.is_valid_uuid(user_id):
             return response.create_response(
-                "This job isn't posted by the given employer id",
-                status.HTTP_406_NOT_ACCEPTABLE
+                {"error": "user-id not present or invalid"},
+                status.HTTP_400_BAD_REQUEST,
             )
 
-        # Update the status of current application
+        error_response = self.check_job_employer(
+            pk, UserTypeCheck.get_employer_id(request)
+        )
+        if error_response:
+            return error_response
+
+        applications = Applicants.objects.filter(job_id=pk, user_id=user_id)
+
+        # Update the status of current application (and the job counters)
         try:
-            Applicants.objects.filter(employer_id=employer_id).update(
-                status=request.data["status"]
+            with transaction.atomic():
+                updated = applicant_counters.change_application_status(
+                    applications, request.data["status"]
+                )
+        except DatabaseError:
+            return response.create_response(
+                response.SOMETHING_WENT_WRONG,
+                status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-        except Exception as err:
+
+        if not updated:
+            return response.create_response(
+                {"error": "This user hasn't applied for this job"},
+                status.HTTP_404_NOT_FOUND,
+            )
+        return response.create_response(
+            "Status has been updated!!",
+            status.HTTP_200_OK
+        )
+
+    @action(detail=True, methods=["post"], permission_classes=[UserTypeCheck])
+    def update_applications(self, request, pk=None):
+        """
+        API: /api/v1/jobs/{pk}/update_applications
+        Bulk version of update_application, the request body has a list of
+        applications of this job with their new status:
+            {
+                "applications": [
+                    {"application_id": 1, "status": "shortlisted"},
+                    {"user_id": "...", "status": "rejected"},
+                ]
+            }
+        The job's ownership is checked once, and the applications are
+        updated with one UPDATE statement per status.
+        """
+
+        updates_per_status, error_message = self.group_application_updates(
+            request.data.get("applications")
+        )
+        if error_message:
+            return response.create_response(error_message, status.HTTP_400_BAD_REQUEST)
+
+        error_response = self.check_job_employer(
+            pk, UserTypeCheck.get_employer_id(request)
+        )
+        if error_response:
+            return error_response
+
+        updated = 0
+        try:
+            with transaction.atomic():
+                for new_status, ids in updates_per_status.items():
+                    application_ids, user_ids = ids
+                    updated += applicant_counters.change_application_status(
+                        Applicants.objects.filter(job_id=pk).filter(
+                            Q(id__in=application_ids) | Q(user_id__in=user_ids)
+                        ),
+                        new_status,
+                    )
+        except DatabaseError:
             return response.create_response(
                 response.SOMETHING_WENT_WRONG,
                 status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         else:
+            return response.create_response({"updated": updated}, status.HTTP_200_OK)
+
+    @staticmethod
+    def group_application_updates(applications):
+        """
+        Validate the list of application updates, and group it by status as
+        {status: (application ids, user ids)}.
+        returns (grouped updates, error message)
+        """
+
+        if not applications or not isinstance(applications, list):
+            return None, "applications not present or invalid"
+        if len(applications) > settings.BATCH_MAX_SIZE:
+            return None, f"at most {settings.BATCH_MAX_SIZE} applications are allowed"
+
+        updates_per_status = {}
+        seen = set()
+        for application in applications:
+            if not isinstance(application, dict):
+                return None, f"application {application} is invalid"
+
+            new_status = application.get("status")
+            if new_status not in values.STATUS_COUNT_FIELDS:
+                return None, f"status {new_status} is invalid"
+
+            application_ids, user_ids = updates_per_status.setdefault(
+                new_status, (set(), set())
+            )
+            if "application_id" in application:
+                application_id = application["application_id"]
+                if not validationClass.is_positive_int(application_id):
+                    return None, f"application_id {application_id} is invalid"
+                key = ("application_id", int(application_id))
+                application_ids.add(key[1])
+            else:
+                user_id = application.get(values.USER_ID)
+                if not validationClass.is_valid_uuid(user_id):
+                    return None, f"user_id {user_id} is invalid"
+                key = (values.USER_ID, user_id)
+                user_ids.add(user_id)
+
+            if key in seen:
+                return None, f"{key[0]} {key[1]} is given more than once"
+            seen.add(key)
+
+        return updates_per_status, None
+
+    @staticmethod
+    def check_job_employer(job_id, employer_id):
+        """
+        check (with a single query) that the job exists and has been posted
+        by the given employer, returns the error response otherwise
+        """
+
+        if not validationClass.is_valid_uuid(job_id):
             return response.create_response(
-                "Status has been updated!!",
-                status.HTTP_200_OK
+                {"error": "job-id isn't a valid UUID"}, status.HTTP_400_BAD_REQUEST
+            )
+
+        job_data = Job.objects.filter(job_id=job_id).values(values.EMPLOYER_ID).first()
+        if not job_data:
+            return response.create_response(
+                {"error": "This job-id doesn't exist"}, status.HTTP_400_BAD_REQUEST
             )
 
+        if str(job_data[values.EMPLOYER_ID]) != str(employer_id):
+            return response.create_response(
+                "This job isn't posted by the given employer id",
+                status.HTTP_406_NOT_ACCEPTABLE
+            )
 
-class UserViewSets(viewsets.ModelViewSet):
+
+class UserViewSets(
+    ObjectBodyMixin, BatchRetrieveMixin, ValuesListMixin, viewsets.ModelViewSet
+):
     """
     User object viewsets
     API: /api/v1/user
@@ -274,10 +627,36 @@ class UserViewSets(viewsets.ModelViewSet):
         1. create or update user
         2. list users/specific user
         3. check jobs applied by a specific user
+        4. batch retrieve users (/user/batch?ids=)
+    list, retrieve and batch take ?fields=/?exclude= (SparseFieldsMixin)
     """
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    list_serializer_class = UserListSerializer
+
+    def get_users_stamp(self, request, pk=None):
+        """version stamp of the user list, or of one user"""
+
+        if pk is None:
+            return table_stamp(values.DB_TABLE_USER_PROFILE)
+        return version_stamp(self.get_queryset().filter(pk=pk))
+
+    def get_user_jobs_stamp(self, request, pk=None):
+        """version stamp of the applications of a user and their jobs"""
+
+        return version_stamp(
+            Applicants.objects.filter(user_id=pk),
+            timestamp_fields=("updated_at", "job__updated_at"),
+        )
+
+    @conditional_response(get_users_stamp)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_response(get_users_stamp)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def update(self, request, *args, **kwargs):
         """
@@ -378,11 +757,18 @@ class UserViewSets(viewsets.ModelViewSet):
         # Once everything's fine, update the db table
         # payload["user_id"] is used in the filter() not the pk present in url
 
-        # get data from the request
-        user_data = request.data
+        # get data from the request, without the columns set here
+        user_data = {
+            key: request.data[key]
+            for key in request.data
+            if key not in (values.USER_ID, "created_at", "updated_at")
+        }
         try:
             # update in the tbl_user_profile
-            User.objects.filter(user_id=payload[values.USER_ID]).update(**user_data)
+            # queryset.update() doesn't set updated_at by itself
+            User.objects.filter(user_id=payload[values.USER_ID]).update(
+                **user_data, updated_at=timezone.now()
+            )
 
             # update in the tbl_user_auth (only - user_name, user_email, user_type)
             tbl_user_auth_data = {
@@ -393,6 +779,11 @@ class UserViewSets(viewsets.ModelViewSet):
             user_auth.objects.filter(id=payload[values.USER_ID]).update(
                 **tbl_user_auth_data
             )
+            # queryset.update() doesn't send post_save, drop the cached
+            # user and employer check here
+            user_cache.pop(payload[values.USER_ID])
+            employer_cache.pop(payload[values.USER_ID])
+            bump_table_version(values.DB_TABLE_USER_PROFILE)
         except:
             print("Exception occurred while updating the user data in the db table")
             return response.create_response(
@@ -407,65 +798,47 @@ class UserViewSets(viewsets.ModelViewSet):
             )
 
     @action(detail=True, methods=["get"])
+    @conditional_response(get_user_jobs_stamp, last_modified=False)
     def jobs(self, request, pk=None):
         """
         API: /api/v1/user/{pk}/jobs
         This method finds out how many jobs a person has applied so far,
         pk here means primary key (basically the user_id)
-        """
 
-        try:
-            if not validationClass.is_valid_uuid(pk):
-                return response.create_response(
-                    f"value {pk} isn't a correct id", status.HTTP_404_NOT_FOUND,
-                )
-            jobs_data = None
-            # get the applications submmited by this user
-            applications = Applicants.objects.filter(user_id=pk).values(values.JOB_ID)
-            if applications.exists():
-                # get the job_ids
-                applications_count = applications.count()
-                jobs_id = [
-                    applications[n][values.JOB_ID] for n in range(0, applications_count)
-                ]
+        The applications are paginated (newest first), and each page is
+        a single query joining this user's applications with their jobs,
+        so every job carries the status of this user's own application.
+        """
 
-                # get the jobs data
-                jobs_data = Job.objects.filter(job_id__in=jobs_id)
-                # here we serialize the data, for comm.
-                serialized_jobs_data = JobSerializer(
-                    jobs_data, many=True, context={"request": request}
-                )
-                serialized_jobs_data = self.get_application_status(serialized_jobs_data)
-                return response.create_response(
-                    serialized_jobs_data.data,
-                    status.HTTP_200_OK
-                )
-            else:
-                return response.create_response(
-                    "You haven't applied to any job",
-                    status.HTTP_200_OK
-                )
-        except django.core.exceptions.ObjectDoesNotExist:
+        if not validationClass.is_valid_uuid(pk):
             return response.create_response(
-                f"person id '{pk}' doesn't exist",
-                status.HTTP_404_NOT_FOUND
+                f"value {pk} isn't a correct id", status.HTTP_404_NOT_FOUND,
             )
 
-    def get_application_status(self, serialized_data):
-        if not serialized_data:
-            raise Exception("Serialized Data not provided")
+        # get the applications submmited by this user, along with the jobs
+        applications = Applicants.objects.filter(user_id=pk).select_related("job")
+        page = self.paginate_queryset(applications)
+        if not page and not request.query_params.get(
+            self.paginator.cursor_query_param
+        ):
+            return response.create_response(
+                "You haven't applied to any job",
+                status.HTTP_200_OK
+            )
 
-        for job_data in serialized_data.data:
-            job_id = job_data.get(values.JOB_ID)
-            user_application = Applicants.objects.filter(job_id=job_id)
-            if user_application.exists():
-                status = user_application.first().status
-                job_data.update({"status": status})
+        # here we serialize the data, for comm.
+        serialized_jobs_data = JobSerializer(
+            [application.job for application in page],
+            many=True,
+            context={"request": request},
+        )
+        for application, job_data in zip(page, serialized_jobs_data.data):
+            job_data.update({"status": application.status})
 
-        return serialized_data
+        return self.get_paginated_response(serialized_jobs_data.data)
 
 
-class CompanyViewSets(viewsets.ModelViewSet):
+class CompanyViewSets(BatchRetrieveMixin, ValuesListMixin, viewsets.ModelViewSet):
     """
     Company object viewsets
     API: /api/v/company
@@ -475,51 +848,130 @@ class CompanyViewSets(viewsets.ModelViewSet):
         2. get jobs available in a company
         3. get user available in a company
         4. list companies/specific company
+        5. batch retrieve companies (/company/batch?ids=)
+    list, retrieve and batch take ?fields=/?exclude= (SparseFieldsMixin)
     """
 
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
+    list_serializer_class = CompanyListSerializer
 
     # Basic filters
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["name", "location"]
 
+    def get_companies_stamp(self, request, pk=None):
+        """version stamp of the company list, or of one company"""
+
+        if pk is None:
+            return table_stamp(values.DB_TABLE_COMPANY)
+        return version_stamp(self.get_queryset().filter(pk=pk))
+
+    def get_company_jobs_stamp(self, request):
+        return table_stamp(values.DB_TABLE_COMPANY) + [(job_cache.list_version(), None)]
+
+    def get_company_users_stamp(self, request):
+        return table_stamp(values.DB_TABLE_COMPANY, values.DB_TABLE_USER_PROFILE)
+
+    @conditional_response(get_companies_stamp)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_response(get_companies_stamp)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=False, methods=["get"])
+    @conditional_response(get_company_jobs_stamp)
     def jobs(self, request):
         """
         Method to get a list of jobs
-        """
-
-        serialized_company_data = self.serializer_class(self.get_queryset(), many=True)
-        for company_data in serialized_company_data.data:
-            company_id = company_data.get(values.COMPANY_ID)
 
-            # get jobs data by company_id from database
-            # .values() returns the QuerySet
-            # jobData = Job.objects.filter(company=companyId).values()
-            job_data = Job.objects.filter(company_id=company_id).values()
-            company_data.update({"Jobs": job_data})
+        API: /api/v1/company/jobs?per_company=N
+        Companies are paginated, and each one carries at most N of its
+        newest jobs, all of them fetched with a single query.
+        """
 
-        return response.create_response(
-            serialized_company_data.data,
-            status.HTTP_200_OK
-        )
+        return self.list_with_rows_per_company(request, Job, "Jobs")
 
     @action(detail=False, methods=["get"])
+    @conditional_response(get_company_users_stamp)
     def users(self, request):
         """
         Method to get the list of users
+
+        API: /api/v1/company/users?per_company=N
+        Same as /company/jobs, but with the users of each company.
         """
 
-        serialized_company_data = self.serializer_class(self.get_queryset(), many=True)
-        for company_data in serialized_company_data.data:
-            company_id = company_data.get(values.COMPANY_ID)
+        return self.list_with_rows_per_company(request, User, "User")
 
-            # Get user information by company_id from database
-            user_data = User.objects.filter(company_id=company_id).values()
-            company_data.update({"User": user_data})
+    def list_with_rows_per_company(self, request, model_class, key):
+        """
+        return a page of companies, each one with a list (under `key`) of
+        the newest rows of model_class that belong to it.
+        """
 
-        return response.create_response(
-            serialized_company_data.data, 
-            status.HTTP_200_OK
+        per_company = request.query_params.get(
+            "per_company", settings.COMPANY_NESTED_ROWS_LIMIT
+        )
+        if not validationClass.is_positive_int(per_company):
+            return response.create_response(
+                f"value {per_company} isn't a correct per_company",
+                status.HTTP_400_BAD_REQUEST,
+            )
+        per_company = min(int(per_company), settings.MAX_PAGE_SIZE)
+
+        companies_data = CompanyListSerializer.values(
+            self.filter_queryset(self.get_queryset()), extra=("created_at", "company_id")
+        )
+        if streaming.is_stream_requested(request):
+            # every company (?stream=1), streamed in chunks
+            return streaming.streaming_json_response(
+                streaming.iterate_in_chunks(companies_data),
+                lambda companies: self.add_rows_per_company(
+                    companies, model_class, key, per_company
+                ),
+            )
+
+        companies = self.paginate_queryset(companies_data)
+        return self.get_paginated_response(
+            self.add_rows_per_company(companies, model_class, key, per_company)
         )
+
+    def add_rows_per_company(self, companies, model_class, key, per_company):
+        """
+        return the serialized companies (.values() rows), each one with the
+        newest `per_company` rows of model_class under `key`
+        """
+
+        serialized_company_data = CompanyListSerializer(companies)
+
+        # a single query gets the rows of every company in the page,
+        # numbered per company so that only the newest `per_company` are kept
+        fields = [field.attname for field in model_class._meta.concrete_fields]
+        rows = (
+            model_class.objects.filter(
+                company_id__in=[company[values.COMPANY_ID] for company in companies]
+            )
+            .annotate(
+                row_number=Window(
+                    RowNumber(),
+                    partition_by=F(values.COMPANY_ID),
+                    order_by=F("created_at").desc(),
+                )
+            )
+            .filter(row_number__lte=per_company)
+            .order_by("-created_at")
+            .values(*fields)
+        )
+
+        rows_per_company = defaultdict(list)
+        for row in rows:
+            rows_per_company[str(row[values.COMPANY_ID])].append(row)
+
+        for company_data in serialized_company_data.data:
+            company_id = company_data.get(values.COMPANY_ID)
+            company_data.update({key: rows_per_company[company_id]})
+
+        return serialized_company_data.data
@@ -0,0 +1,128 @@
+"""
+Benchmark of the response compression (CompressionMiddleware) on the
+largest endpoints: bytes saved and CPU time spent per response, for gzip
+and brotli (when the Brotli package is installed).
+
+The responses are built by the real views from an in-memory sqlite
+database, so it doesn't need MySQL.
+
+Usage (from the repository root):
+    python benchmarks/bench_compression.py [--jobs N] [--repeat N]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+from null_jobs_backend import settings as project_settings  # noqa: E402
+
+settings.configure(
+    **{
+        name: getattr(project_settings, name)
+        for name in dir(project_settings)
+        if name.isupper()
+    },
+)
+settings.DATABASES = {
+    "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+}
+settings.ALLOWED_HOSTS = ["testserver"]
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from apps.jobs.models import Company, Job  # noqa: E402
+from null_jobs_backend import middleware  # noqa: E402
+
+ENDPOINTS = (
+    "/jobs/?page_size=50",
+    "/jobs/?page_size=500",
+    "/jobs/?stream=1",
+    "/company/jobs/?per_company=50",
+    "/company/jobs/?stream=1",
+)
+
+
+def create_jobs(count):
+    companies = Company.objects.bulk_create(
+        Company(name=f"Company {number}", location="Remote", about="")
+        for number in range(max(count // 100, 1))
+    )
+    Job.objects.bulk_create(
+        Job(
+            job_role=f"Software Developer {number}",
+            company=companies[number % len(companies)],
+            description="Build and maintain the backend services " * 4,
+            location="Remote",
+            post_date=datetime.date(2023, 10, 1),
+            posted=True,
+            experience=number % 10,
+            employer_id=uuid.uuid4(),
+        )
+        for number in range(count)
+    )
+
+
+def get_content(client, url):
+    """uncompressed body of the endpoint (no Accept-Encoding)"""
+
+    response = client.get(url)
+    if response.streaming:
+        return b"".join(response.streaming_content)
+    return response.content
+
+
+def cpu_time(function, repeat):
+    """best process (CPU) time of function, in seconds"""
+
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        function()
+        timings.append(time.process_time() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    call_command("migrate", verbosity=0)
+    create_jobs(args.jobs)
+
+    client = Client()
+    compression = middleware.CompressionMiddleware(lambda request: None)
+    encodings = ["gzip"] + (["br"] if middleware.brotli is not None else [])
+
+    print(f"{args.jobs} jobs, brotli installed: {middleware.brotli is not None}")
+    print(
+        f"\n{'endpoint':<32} {'encoding':<8} {'bytes':>10} {'compressed':>11}"
+        f" {'saved':>7} {'cpu ms':>8}"
+    )
+    for url in ENDPOINTS:
+        content = get_content(client, url)
+        for encoding in encodings:
+            compressed = compression.compress(encoding, content)
+            seconds = cpu_time(
+                lambda: compression.compress(encoding, content), args.repeat
+            )
+            saved = 1 - len(compressed) / len(content)
+            print(
+                f"{url:<32} {encoding:<8} {len(content):>10} {len(compressed):>11}"
+                f" {saved:>7.1%} {seconds * 1000:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark of the list serializers: JobSerializer(many=True) on model
+instances against JobListSerializer on .values() rows.
+
+The jobs are created in an in-memory sqlite database, so it doesn't need
+MySQL. Both the time and the peak memory allocated (tracemalloc) are
+reported, with and without the query.
+
+Usage (from the repository root):
+    python benchmarks/bench_list_serializers.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import timeit
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+from null_jobs_backend import settings as project_settings  # noqa: E402
+
+settings.configure(
+    **{
+        name: getattr(project_settings, name)
+        for name in dir(project_settings)
+        if name.isupper()
+    },
+)
+settings.DATABASES = {
+    "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+}
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.jobs.models import Company, Job  # noqa: E402
+from apps.jobs.serializers import JobListSerializer, JobSerializer  # noqa: E402
+
+
+def create_jobs(count):
+    company = Company.objects.create(name="Company", location="Remote", about="")
+    Job.objects.bulk_create(
+        Job(
+            job_role=f"Software Developer {number}",
+            company=company,
+            description="Build and maintain the backend services " * 4,
+            location="Remote",
+            post_date=datetime.date(2023, 10, 1),
+            posted=True,
+            experience=number % 10,
+            employer_id=uuid.uuid4(),
+        )
+        for number in range(count)
+    )
+
+
+def serialize_instances():
+    return JobSerializer(Job.objects.all(), many=True).data
+
+
+def serialize_values():
+    return JobListSerializer(Job.objects.all()).data
+
+
+def peak_memory(function):
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    call_command("migrate", verbosity=0)
+    create_jobs(args.rows)
+
+    renderer = JSONRenderer()
+    if renderer.render(serialize_instances()) != renderer.render(serialize_values()):
+        sys.exit("the outputs differ")
+
+    instances = list(Job.objects.all())
+    rows = list(JobListSerializer.values(Job.objects.all()))
+    benchmarks = {
+        "query + serialization": (
+            ("JobSerializer", serialize_instances),
+            ("JobListSerializer", serialize_values),
+        ),
+        "serialization of the fetched rows": (
+            ("JobSerializer", lambda: JobSerializer(instances, many=True).data),
+            ("JobListSerializer", lambda: JobListSerializer(rows).data),
+        ),
+    }
+
+    for title, functions in benchmarks.items():
+        print(f"\n{title}, {args.rows} jobs (best of {args.repeat})")
+        for name, function in functions:
+            seconds = min(timeit.repeat(function, number=1, repeat=args.repeat))
+            peak = peak_memory(function)
+            print(f"  {name:<18} {seconds * 1000:9.1f} ms {peak / 2**20:9.1f} MiB peak")
+
+
+if __name__ == "__main__":
+    main()
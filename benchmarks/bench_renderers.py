@@ -0,0 +1,116 @@
+"""
+Microbenchmark of the JSON renderers on large payloads.
+
+Compares the previous UserRenderer (str(data) scan + json.dumps), DRF's
+JSONRenderer and the FastJSONRenderer/UserRenderer of apps/accounts.
+
+Usage (from the repository root):
+    python benchmarks/bench_renderers.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure(
+    INSTALLED_APPS=["django.contrib.contenttypes", "django.contrib.auth"],
+    USE_TZ=True,
+)
+django.setup()
+
+from rest_framework import renderers  # noqa: E402
+from rest_framework.exceptions import ErrorDetail  # noqa: E402
+from rest_framework.response import Response  # noqa: E402
+
+from apps.accounts import renderers as fast_renderers  # noqa: E402
+
+
+class OldUserRenderer(renderers.JSONRenderer):
+    """UserRenderer as it was before FastJSONRenderer"""
+
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = ""
+        if "ErrorDetail" in str(data):
+            response = json.dumps({"errors": data})  # if error occurred
+        else:
+            response = json.dumps(data)
+
+        return response
+
+
+def job_rows(count):
+    """rows shaped like the serialized /jobs list"""
+
+    created_at = datetime.datetime(2023, 10, 1, 12, 30, tzinfo=datetime.timezone.utc)
+    return [
+        {
+            "job_id": str(uuid.uuid4()),
+            "job_role": f"Software Developer {number}",
+            "company": str(uuid.uuid4()),
+            "description": "Build and maintain the backend services " * 4,
+            "location": "Remote",
+            "post_date": "2023-10-01",
+            "posted": True,
+            "experience": number % 10,
+            "created_at": created_at.isoformat(),
+            "updated_at": created_at.isoformat(),
+            "employer_id": str(uuid.uuid4()),
+            "applicants_count": number,
+            "Number of Applicants": number,
+        }
+        for number in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    success = {"data": {"next": None, "previous": None, "results": job_rows(args.rows)}}
+    errors = {
+        f"field_{number}": [ErrorDetail("This field is required.", code="required")]
+        for number in range(args.rows)
+    }
+    contexts = {
+        "success": {"response": Response(status=200)},
+        "errors": {"response": Response(status=400)},
+    }
+
+    candidates = [
+        ("old UserRenderer", OldUserRenderer()),
+        ("JSONRenderer", renderers.JSONRenderer()),
+        ("FastJSONRenderer", fast_renderers.FastJSONRenderer()),
+        ("UserRenderer", fast_renderers.UserRenderer()),
+    ]
+
+    print(f"orjson installed: {fast_renderers.orjson is not None}")
+    for payload_name, payload in (("success", success), ("errors", errors)):
+        print(f"\n{payload_name} payload, {args.rows} rows (best of {args.repeat})")
+        for name, renderer in candidates:
+            seconds = min(
+                timeit.repeat(
+                    lambda: renderer.render(
+                        payload, renderer_context=contexts[payload_name]
+                    ),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            print(f"  {name:<18} {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Response compression, for the large JSON bodies of the API (/jobs/,
+/company/jobs/, the streamed lists and exports).
+
+CompressionMiddleware works like django's GZipMiddleware, with brotli when
+the Brotli package is installed and the client accepts it, and only for
+the content types of COMPRESSION_CONTENT_TYPES that are at least
+COMPRESSION_MIN_SIZE bytes long (streamed responses are always
+compressed, their size isn't known). The gzip output keeps GZipMiddleware's
+BREACH mitigation (random bytes in the gzip header). Brotli has no header
+to pad, so the responses that may hold a secret (they set a cookie or
+use the CSRF token) are always gzipped.
+"""
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    max_random_bytes = 100
+
+    def process_response(self, request, response):
+        if not self.is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = choose_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""),
+            allow_brotli=not self.may_hold_secret(request, response),
+        )
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self.compress_stream(
+                encoding, response.streaming_content, response.is_async
+            )
+            # the compressed size isn't known until it's streamed
+            del response.headers["Content-Length"]
+        else:
+            compressed_content = self.compress(encoding, response.content)
+            # only if it's actually shorter
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers["Content-Length"] = str(len(response.content))
+
+        # a strong ETag becomes weak (RFC 9110 Section 8.8.1), it still
+        # matches the conditional requests
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    @staticmethod
+    def is_compressible(response):
+        if response.has_header("Content-Encoding"):
+            return False
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type not in settings.COMPRESSION_CONTENT_TYPES:
+            return False
+        return response.streaming or len(response.content) >= (
+            settings.COMPRESSION_MIN_SIZE
+        )
+
+    @staticmethod
+    def may_hold_secret(request, response):
+        """
+        True for the responses BREACH could read a secret from, without the
+        length randomization of gzip: the ones setting a cookie or using
+        the CSRF token
+        """
+
+        return bool(response.cookies) or bool(request.META.get("CSRF_COOKIE_USED"))
+
+    def compress(self, encoding, content):
+        if encoding == "br":
+            return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return compress_string(content, max_random_bytes=self.max_random_bytes)
+
+    def compress_stream(self, encoding, chunks, is_async=False):
+        if is_async:
+            return self.compress_async_stream(encoding, chunks)
+        if encoding == "br":
+            return brotli_compress_sequence(chunks)
+        return compress_sequence(chunks, max_random_bytes=self.max_random_bytes)
+
+    async def compress_async_stream(self, encoding, chunks):
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            async for chunk in chunks:
+                yield compressor.process(chunk) + compressor.flush()
+            yield compressor.finish()
+        else:
+            # one gzip member per chunk, like GZipMiddleware
+            async for chunk in chunks:
+                yield compress_string(chunk, max_random_bytes=self.max_random_bytes)
+
+
+def brotli_compress_sequence(chunks):
+    compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+    for chunk in chunks:
+        # flushed after every chunk, so the client gets them as they come
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def choose_encoding(accept_encoding, allow_brotli=True):
+    """
+    Return "br", "gzip" or None: the best encoding the client accepts
+    (Accept-Encoding header, with its q-values), gzip or None without
+    allow_brotli
+    """
+
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    available = ("br", "gzip") if brotli is not None and allow_brotli else ("gzip",)
+    candidates = [
+        (qualities.get(coding, qualities.get("*", 0.0)), coding) for coding in available
+    ]
+    # highest q-value first, brotli first at equal q-values
+    quality, coding = max(candidates, key=lambda candidate: candidate[0])
+    return coding if quality > 0 else None
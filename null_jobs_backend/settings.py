@@ -58,6 +58,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # compresses the response body, before the middlewares that read it
+    "null_jobs_backend.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -148,6 +150,28 @@ ACCOUNT_USERNAME_REQUIRED = False
 ACCOUNT_USER_MODEL_USERNAME_FIELD = None
 GOOGLE_REDIRECT_URI = "http://localhost:8000/google/login/callback/"
 
+# Google OAuth code exchange (apps.accounts.google)
+GOOGLE_OAUTH_CLIENT_ID = os.environ.get("GOOGLE_OAUTH_CLIENT_ID")
+GOOGLE_OAUTH_SECRET = os.environ.get("GOOGLE_OAUTH_SECRET")
+GOOGLE_OAUTH_TOKEN_URL = os.getenv(
+    "GOOGLE_OAUTH_TOKEN_URL", "https://oauth2.googleapis.com/token"
+)
+GOOGLE_OAUTH_USERINFO_URL = os.getenv(
+    "GOOGLE_OAUTH_USERINFO_URL", "https://www.googleapis.com/oauth2/v3/userinfo"
+)
+GOOGLE_OAUTH_JWKS_URL = os.getenv(
+    "GOOGLE_OAUTH_JWKS_URL", "https://www.googleapis.com/oauth2/v3/certs"
+)
+GOOGLE_OAUTH_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+# (connect, read) timeouts in seconds, retries of the connection errors and
+# 429/5xx answers with exponential backoff (seconds), pooled connections
+GOOGLE_OAUTH_TIMEOUT = (3.05, 10)
+GOOGLE_OAUTH_RETRIES = 2
+GOOGLE_OAUTH_BACKOFF = 0.5
+GOOGLE_OAUTH_POOL_SIZE = 10
+# seconds the Google signing keys (JWKS) are cached
+GOOGLE_OAUTH_JWKS_LIFESPAN = 3600
+
 # dj-rest-auth setting
 JWT_AUTH_SECURE = True
 REST_USE_JWT = True
@@ -162,15 +186,94 @@ EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 EMAIL_PORT = os.getenv("EMAIL_PORT")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL")
+# seconds before a blocked SMTP connection fails, for the outbox worker
+EMAIL_TIMEOUT = 30
+
+# outgoing email outbox (apps.accounts.models.EmailOutbox), sent by
+# manage.py send_emails: emails per SMTP connection, sends before an email
+# is marked failed, and the delay (seconds) before the first retry,
+# doubled after every failed send
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+# seconds a batch is reserved for its worker, longer than it takes to
+# send it: a batch not done by then is sent again by another worker
+EMAIL_OUTBOX_LEASE = 600
 
 # JWT Configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-        "dj_rest_auth.jwt_auth.JWTCookieAuthentication",  # dj-rest-auth for jwt
+        # simplejwt/dj-rest-auth JWT authentication, stateless with
+        # JWT_STATELESS_AUTH (apps.accounts.authentication)
+        "apps.accounts.authentication.StatelessJWTAuthentication",
+        "apps.accounts.authentication.StatelessJWTCookieAuthentication",
+    ),
+    # orjson-backed JSON (when installed), used by response.create_response too
+    "DEFAULT_RENDERER_CLASSES": (
+        "apps.accounts.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ),
+    # cursor (keyset) pagination for the list endpoints
+    "DEFAULT_PAGINATION_CLASS": "apps.jobs.utils.pagination.CreatedAtCursorPagination",
+    "PAGE_SIZE": int(os.getenv("PAGE_SIZE", "50")),
 }
 
+# hard cap on the ?page_size= query parameter
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+
+# default number of jobs/users embedded per company in /company/jobs and
+# /company/users (?per_company=), capped by MAX_PAGE_SIZE as well
+COMPANY_NESTED_ROWS_LIMIT = int(os.getenv("COMPANY_NESTED_ROWS_LIMIT", "20"))
+
+# maximum number of items accepted by the bulk/batch endpoints
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "500"))
+
+# rows read (and rendered) at once by the streamed lists (?stream=1)
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "1000"))
+
+# Response compression (null_jobs_backend.middleware.CompressionMiddleware),
+# gzip, or brotli when the Brotli package is installed. Smaller responses
+# (in bytes) aren't worth compressing, streamed responses always are.
+# Brotli has no BREACH mitigation (gzip gets random header bytes), so the
+# responses that set a cookie or use the CSRF token are always gzipped.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_CONTENT_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "application/javascript",
+}
+# 0 (fastest) to 11 (smallest), 4-5 is the usual trade-off for dynamic content
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+# Cache used for the job detail and job list responses. Local memory by
+# default (per process), set CACHE_BACKEND/CACHE_LOCATION to share it
+# between the workers, e.g.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# CACHE_LOCATION=redis://127.0.0.1:6379/1
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "null-jobs"),
+    }
+}
+
+# seconds a cached job detail/list response is kept (writes invalidate it)
+JOBS_CACHE_TIMEOUT = int(os.getenv("JOBS_CACHE_TIMEOUT", "300"))
+
+# seconds an expired job response is still served while one request
+# rebuilds it (stale-while-revalidate)
+JOBS_CACHE_STALE_GRACE = int(os.getenv("JOBS_CACHE_STALE_GRACE", "30"))
+
+# seconds a request holds the lock to build a missing job response, the
+# other requests wait at most that long for it
+JOBS_CACHE_LOCK_TIMEOUT = int(os.getenv("JOBS_CACHE_LOCK_TIMEOUT", "10"))
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -220,6 +323,28 @@ SIMPLE_JWT = {
     "JTI_CLAIM": "jti",
 }
 
+# Build the request user from the claims of the access token (user_id,
+# user_type, is_verified) instead of loading it on every request. Note that
+# a deactivated user keeps access until the token expires.
+JWT_STATELESS_AUTH = os.getenv("JWT_STATELESS_AUTH", "") == "True"
+
+# seconds a tbl_user_auth row is kept in the per-process user cache of the
+# stateless authentication, and the number of users kept
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "30"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+
+# seconds an employer check (UserTypeCheck.is_user_employer) is kept per
+# process for the requests without a user_type claim, and the number kept
+EMPLOYER_CACHE_TTL = int(os.getenv("EMPLOYER_CACHE_TTL", "60"))
+EMPLOYER_CACHE_SIZE = int(os.getenv("EMPLOYER_CACHE_SIZE", "4096"))
+
+# Revoked refresh tokens (apps.accounts.revocation): seconds between two
+# syncs of a process with the token blacklist, and the number of
+# blacklisted tokens and false-positive rate the bloom filter is sized for
+TOKEN_REVOCATION_SYNC_INTERVAL = int(os.getenv("TOKEN_REVOCATION_SYNC_INTERVAL", "5"))
+TOKEN_REVOCATION_CAPACITY = int(os.getenv("TOKEN_REVOCATION_CAPACITY", "100000"))
+TOKEN_REVOCATION_ERROR_RATE = 0.001
+
 # needed for reset password
 PASSWORD_RESET_TIMEOUT = 900  # 900 sec=15 min
 
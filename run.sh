@@ -1,7 +1,5 @@
 #!/bin/bash
 
-python manage.py makemigrations
-python manage.py makemigrations apps.jobs
-python manage.py makemigrations apps.accounts
+# migrations are committed in apps/*/migrations, only apply them here
 python manage.py migrate
 python manage.py runserver 0.0.0.0:8000